@@ -1,10 +1,15 @@
-from flask import Blueprint, jsonify, request, render_template, current_app
-from app.utils.db import get_grouped_data
+from flask import Blueprint, Response, jsonify, request, render_template, current_app, stream_with_context
+from app.utils.db import get_pool_stats, get_last_fetch_stats
+from app.utils.snapshot import dag_snapshot, dag_loader
+from app.utils.broadcast import status_broadcaster, format_sse
 from app import cache
+from app.utils.cache import get_cache_stats
 import logging
 import time
 import traceback
 import os
+import queue
+from datetime import datetime, timezone
 from functools import wraps
 
 logger = logging.getLogger('dashboard')
@@ -23,18 +28,19 @@ def monitor_cache(f):
 @bp.route('/')
 def index():
     try:
-        # Get grouped data
-        grouped_data = get_grouped_data()
-        if not grouped_data:
+        # Get indexed data from the shared snapshot
+        dag_index = dag_snapshot.get()
+        if not dag_index:
             return render_template('error.html', 
                                 error_title='No Data Available',
                                 error='No dashboard data found')
         
         # Get list of subjects
-        subjects = list(grouped_data.keys())
+        subjects = list(dag_index.grouped_data.keys())
         
         return render_template('index.html', 
-                             grouped_data=grouped_data,
+                             grouped_data=dag_index.grouped_data,
+                             status_counts=dag_index.counts,
                              subjects=subjects)
     except Exception as e:
         logger.error(f"Error loading dashboard: {str(e)}", exc_info=True)
@@ -44,7 +50,6 @@ def index():
 
 @bp.route('/dag_status')
 @monitor_cache
-@cache.cached(timeout=30, query_string=True)
 def dag_status():
     try:
         start_time = time.time()
@@ -60,24 +65,13 @@ def dag_status():
             logger.warning("Missing parameters in dag_status request")
             return jsonify({'error': 'Missing required parameters'}), 400
 
-        grouped_data = get_grouped_data()
+        dag_index = dag_snapshot.get()
         
-        if subject_area not in grouped_data:
+        if not dag_index or subject_area not in dag_index:
             logger.info("No data found for subject area: %s", subject_area)
             return jsonify([])
 
-        filtered_data = [
-            {
-                'dag_name': item['dag_name'],
-                'status': item['status'],
-                'dag_start_time': item['dag_start_time'],
-                'dag_end_time': item['dag_end_time'],
-                'modified_ts': item['modified_ts'],
-                'elapsed_time': item['elapsed_time']
-            }
-            for item in grouped_data[subject_area]
-            if item['status'].lower() == status
-        ]
+        filtered_data = [item.to_json() for item in dag_index.rows(subject_area, status)]
 
         duration = time.time() - start_time
         logger.info("Retrieved %d records for status request in %.2f seconds",
@@ -94,6 +88,63 @@ def dag_status():
         )
         return jsonify({'error': 'Internal server error'}), 500
 
+@bp.route('/dag_status/summary')
+@monitor_cache
+def dag_status_summary():
+    """Return per-status DAG counts for every subject area in one response"""
+    try:
+        start_time = time.time()
+        dag_index = dag_snapshot.get()
+        summary = dag_index.counts if dag_index else {}
+
+        duration = time.time() - start_time
+        logger.info("Built status summary for %d subject areas in %.2f seconds",
+                   len(summary), duration)
+        return jsonify({
+            'subjects': summary,
+            'generated_at': datetime.now(timezone.utc).isoformat()
+        })
+
+    except Exception as e:
+        logger.error(f"Error building status summary: {str(e)}", exc_info=True)
+        return jsonify({'error': 'Internal server error'}), 500
+
+@bp.route('/dag_status/stream')
+def dag_status_stream():
+    """Stream status count changes to the dashboard as Server-Sent Events"""
+    heartbeat = current_app.config.get('LIVE_HEARTBEAT_INTERVAL', 15)
+
+    def generate():
+        # Subscribed inside the generator so a client that disconnects before
+        # the first chunk never leaves a subscriber behind
+        subscriber = None
+        try:
+            subscriber = status_broadcaster.subscribe()
+            dag_index = dag_snapshot.get()
+            yield format_sse({
+                'subjects': dag_index.counts if dag_index else {},
+                'generated_at': datetime.now(timezone.utc).isoformat()
+            }, event='summary')
+
+            while True:
+                try:
+                    yield subscriber.get(timeout=heartbeat)
+                except queue.Empty:
+                    # Comment line keeps proxies from closing an idle stream
+                    yield ': keepalive\n\n'
+        finally:
+            if subscriber is not None:
+                status_broadcaster.unsubscribe(subscriber)
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'
+        }
+    )
+
 @bp.route('/package-parser')
 def package_parser():
     try:
@@ -152,18 +203,35 @@ def cache_status():
         cache_stats = {
             'cache_type': current_app.config.get('CACHE_TYPE', 'unknown'),
             'cache_timeout': current_app.config.get('CACHE_DEFAULT_TIMEOUT', 'unknown'),
-            'cache_enabled': cache.cache is not None
+            'cache_enabled': cache.cache is not None,
+            'cache_stats': get_cache_stats(),
+            'dag_snapshot': dag_snapshot.stats(),
+            'stream_subscribers': status_broadcaster.subscriber_count()
         }
         return jsonify(cache_stats)
     except Exception as e:
         logger.error(f"Error checking cache status: {str(e)}", exc_info=True)
         return jsonify({'error': 'Failed to check cache status'}), 500
 
+# Add a route to check database connection pool status
+@bp.route('/pool-status')
+def pool_status():
+    try:
+        return jsonify({
+            'pool': get_pool_stats(),
+            'last_fetch': get_last_fetch_stats()
+        })
+    except Exception as e:
+        logger.error(f"Error checking pool status: {str(e)}", exc_info=True)
+        return jsonify({'error': 'Failed to check pool status'}), 500
+
 # Add a route to clear cache
 @bp.route('/clear-cache')
 def clear_cache():
     try:
         cache.clear()
+        dag_loader.request_full_resync()
+        dag_snapshot.invalidate()
         return jsonify({'message': 'Cache cleared successfully'})
     except Exception as e:
         logger.error(f"Error clearing cache: {str(e)}", exc_info=True)
@@ -1,10 +1,18 @@
-from flask import Blueprint, render_template, jsonify
+from flask import Blueprint, render_template, jsonify, request
 import requests
 from datetime import datetime
 import pytz
 import traceback
 import logging
-from config import MONITORED_PACKAGES
+import time
+from operator import itemgetter
+from concurrent.futures import ThreadPoolExecutor, wait
+from config import Config, MONITORED_PACKAGES
+from app.utils.pypi_cache import PackageMetadataCache
+from app.utils.package_monitor import PackageMonitor
+from app.utils.version_store import VersionStore
+from app.utils.json_stream import read_members
+from app.utils.http import HttpClient
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -15,17 +23,198 @@ logging.basicConfig(
 
 package_bp = Blueprint('package', __name__)
 
+# On-disk PyPI metadata cache shared by all workers
+metadata_cache = PackageMetadataCache(Config.PYPI_CACHE_DIR, ttl=Config.PYPI_CACHE_TTL)
+
+# Last-seen versions and version change history
+version_store = VersionStore(Config.VERSION_STORE_PATH)
+
+# Fields of the PyPI "info" object kept in the metadata cache
+INFO_FIELDS = ('summary', 'author', 'license', 'home_page', 'requires_python')
+JSON_CHUNK_SIZE = 64 * 1024
+PACKAGE_SORTS = ('last_update', 'name', 'status')
+# Statuses returned by get_package_status, freshest first
+PACKAGE_STATUSES = ('Recent', 'Active', 'Stable', 'Inactive', 'Unknown')
+# Timezone package update times are shown in, resolved once
+DISPLAY_TZ = pytz.timezone('America/New_York')
+
+# Shared pool bounding concurrent PyPI requests across all package routes
+_fetch_executor = ThreadPoolExecutor(
+    max_workers=Config.PYPI_MAX_WORKERS,
+    thread_name_prefix='pypi-fetch'
+)
+
+# Keep-alive session sized so every fetch thread can hold a PyPI connection.
+# No request may wait longer than a whole batch, since fetches still running
+# after the deadline keep holding their _fetch_executor thread.
+pypi_client = HttpClient(
+    pool_size=Config.PYPI_MAX_WORKERS,
+    retries=Config.API_RETRY_ATTEMPTS,
+    backoff=Config.API_RETRY_BACKOFF,
+    timeout=min(Config.API_TIMEOUT, Config.PYPI_BATCH_DEADLINE)
+)
+
+def fetch_package_infos(package_names, deadline=None):
+    """Fetch PyPI info for several packages concurrently.
+
+    Waits at most ``deadline`` seconds for the whole batch. Returns a tuple
+    ``(packages, errors)``: info dicts for the fetches that succeeded in
+    time, in the order of ``package_names``, and one message per package
+    that failed or missed the deadline.
+    """
+    if deadline is None:
+        deadline = Config.PYPI_BATCH_DEADLINE
+
+    start_time = time.time()
+    futures = {name: _fetch_executor.submit(get_package_info, name) for name in package_names}
+    done, not_done = wait(futures.values(), timeout=deadline)
+
+    packages = []
+    errors = []
+    for name, future in futures.items():
+        if future not in done:
+            future.cancel()
+            error_msg = f"Timed out fetching information for {name}"
+            logger.warning(error_msg)
+            errors.append(error_msg)
+            continue
+        try:
+            package_info = future.result()
+        except Exception as e:
+            error_msg = f"Error processing {name}: {str(e)}"
+            logger.error(f"{error_msg}\n{traceback.format_exc()}")
+            errors.append(error_msg)
+            continue
+        if package_info:
+            packages.append(package_info)
+        else:
+            error_msg = f"Failed to fetch information for {name}"
+            logger.warning(error_msg)
+            errors.append(error_msg)
+
+    logger.info(f"Fetched {len(packages)}/{len(futures)} packages in {time.time() - start_time:.2f}s "
+                f"({len(not_done)} timed out)")
+    return packages, errors
+
+def build_package_snapshot():
+    """Fetch every monitored package and precompute what the package routes serve"""
+    packages, errors = fetch_package_infos(MONITORED_PACKAGES)
+    
+    # Sort packages by last update time (newest first)
+    packages.sort(key=itemgetter('updated_at'), reverse=True)
+    
+    # Diff against the stored versions; only real changes become notifications
+    version_store.record_versions({p['name']: p['version'] for p in packages})
+    updated = version_store.recently_updated(Config.PACKAGE_UPDATE_WINDOW_DAYS)
+    for package_info in packages:
+        package_info['has_update'] = package_info['name'] in updated
+    notifications = version_store.notifications(limit=Config.PACKAGE_NOTIFICATION_LIMIT)
+    
+    package_index = index_packages(packages)
+    
+    return {
+        'packages': packages,
+        'errors': errors,
+        'notifications': notifications,
+        'package_index': package_index,
+        'status_counts': {status: len(rows) for status, rows in package_index['last_update'].items() if status},
+        'total_packages': len(MONITORED_PACKAGES),
+        'generated_at': datetime.now(pytz.UTC).isoformat()
+    }
+
+def index_packages(packages):
+    """Precompute every sort order, each split into status buckets.
+
+    Returns ``{sort: {status: [package, ...]}}`` where the ``None`` status
+    holds all packages, so a page query is a dict lookup plus a slice.
+    ``packages`` must already be in last-update order (newest first).
+    """
+    status_rank = {status: rank for rank, status in enumerate(PACKAGE_STATUSES)}
+    orders = {
+        'last_update': packages,
+        'name': sorted(packages, key=lambda p: p['name'].lower()),
+        # Stable sort keeps newest first within each status
+        'status': sorted(packages, key=lambda p: status_rank.get(p['status'], len(status_rank)))
+    }
+    index = {}
+    for sort, ordered in orders.items():
+        buckets = {None: ordered}
+        for package_info in ordered:
+            buckets.setdefault(package_info['status'], []).append(package_info)
+        index[sort] = buckets
+    return index
+
+def query_packages(snapshot, page=1, per_page=None, sort='last_update', status=None, search=None):
+    """Return one page of the snapshot's packages.
+
+    ``sort`` is one of PACKAGE_SORTS, prefixed with ``-`` to reverse it;
+    ``status`` selects a single status bucket and ``search`` matches a
+    substring of the package name. Raises ValueError for an unknown sort
+    or status.
+    """
+    per_page = min(max(per_page or Config.PACKAGE_PAGE_SIZE, 1), Config.PACKAGE_MAX_PAGE_SIZE)
+    page = max(page, 1)
+
+    descending = sort.startswith('-')
+    sort = sort.lstrip('-')
+    if sort not in PACKAGE_SORTS:
+        raise ValueError(f"Unknown sort '{sort}', expected one of {', '.join(PACKAGE_SORTS)}")
+    if status:
+        status = status.capitalize()
+        if status not in PACKAGE_STATUSES:
+            raise ValueError(f"Unknown status '{status}', expected one of {', '.join(PACKAGE_STATUSES)}")
+
+    rows = snapshot['package_index'][sort].get(status or None, [])
+    if search:
+        search = search.strip().lower()
+        rows = [p for p in rows if search in p['name'].lower()]
+
+    total = len(rows)
+    start = (page - 1) * per_page
+    end = min(start + per_page, total)
+    if descending:
+        page_rows = rows[total - end:total - start][::-1] if start < total else []
+    else:
+        page_rows = rows[start:end]
+
+    return {
+        'packages': page_rows,
+        'page': page,
+        'per_page': per_page,
+        'total': total,
+        'pages': (total + per_page - 1) // per_page,
+        'has_more': end < total
+    }
+
+@package_bp.app_template_filter('format_timestamp')
+def format_timestamp(value):
+    """Format an aware datetime in the display timezone, e.g. '2024-07-01 08:00:00 EDT'"""
+    return value.astimezone(DISPLAY_TZ).strftime('%Y-%m-%d %H:%M:%S %Z')
+
+def serialize_package(package_info):
+    """Return a JSON-ready copy of a package dict with its update time rendered"""
+    data = dict(package_info)
+    updated_at = data.pop('updated_at')
+    data['last_update'] = updated_at.isoformat()
+    data['last_update_display'] = format_timestamp(updated_at)
+    return data
+
+# Background poller keeping the package snapshot current
+package_monitor = PackageMonitor(build_package_snapshot, interval=Config.PACKAGE_REFRESH_INTERVAL)
+
+def get_package_snapshot(refresh=False):
+    """Return the current package snapshot, waiting for the first build if needed"""
+    timeout = Config.PYPI_BATCH_DEADLINE + 5
+    if refresh:
+        return package_monitor.refresh(timeout=timeout)
+    return package_monitor.get(timeout=timeout)
+
 @package_bp.route('/')
 @package_bp.route('/package-parser')
 def package_parser():
     """Route to render the package parser page"""
     try:
-        packages = []
-        notifications = []
-        errors = []
-        
-        logger.info(f"Starting package version check for {len(MONITORED_PACKAGES)} packages")
-        logger.debug(f"Packages to check: {MONITORED_PACKAGES}")
+        logger.info(f"Rendering package parser for {len(MONITORED_PACKAGES)} packages")
         
         if not MONITORED_PACKAGES:
             logger.warning("No packages configured in MONITORED_PACKAGES")
@@ -38,55 +227,30 @@ def package_parser():
                 failed_packages=0
             )
         
-        for package_name in MONITORED_PACKAGES:
-            try:
-                logger.info(f"Processing package: {package_name}")
-                package_info = get_package_info(package_name)
-                
-                if package_info:
-                    # Store the actual datetime object for sorting
-                    packages.append(package_info)
-                    logger.info(f"Successfully processed {package_name}")
-                    
-                    # Add notification if package has an update
-                    if package_info.get('has_update'):
-                        notifications.append({
-                            'type': 'info',
-                            'message': f"Update available for {package_name}: {package_info['version']}",
-                            'package_name': package_name,
-                            'timestamp': datetime.now(pytz.UTC).isoformat()
-                        })
-                else:
-                    error_msg = f"Failed to fetch information for {package_name}"
-                    logger.warning(error_msg)
-                    errors.append(error_msg)
-                    
-            except Exception as e:
-                error_msg = f"Error processing {package_name}: {str(e)}"
-                logger.error(f"{error_msg}\n{traceback.format_exc()}")
-                errors.append(error_msg)
-                continue
-        
-        # Sort packages by last update time (newest first)
-        packages.sort(key=lambda x: datetime.strptime(x['last_update'].replace(' EST', ''), '%Y-%m-%d %H:%M:%S'), reverse=True)
-        
-        logger.info(f"Successfully processed {len(packages)} packages")
-        logger.debug(f"Package data: {packages}")
+        snapshot = get_package_snapshot()
+        if snapshot is None:
+            raise RuntimeError("Package information is not available yet")
         
+        # Only the first page is rendered; the rest is loaded through the API
+        package_page = query_packages(snapshot)
+        packages = package_page['packages']
+        errors = snapshot['errors']
+        notifications = list(snapshot['notifications'])
         if errors:
             notifications.extend([{
                 'type': 'error', 
                 'message': error,
                 'package_name': 'System',
-                'timestamp': datetime.now(pytz.UTC).isoformat()
+                'timestamp': snapshot['generated_at']
             } for error in errors])
         
         return render_template(
             'package_parser.html',
             packages=packages,
+            package_page=package_page,
             notifications=notifications,
-            total_packages=len(MONITORED_PACKAGES),
-            successful_packages=len(packages),
+            total_packages=snapshot['total_packages'],
+            successful_packages=len(snapshot['packages']),
             failed_packages=len(errors)
         )
                              
@@ -107,55 +271,114 @@ def package_parser():
             failed_packages=1
         )
 
+def extract_metadata(info, upload_time=''):
+    """Reduce the ``info`` member of a PyPI project JSON to the fields the monitor uses"""
+    metadata = {field: info[field] for field in INFO_FIELDS if field in info}
+    metadata.update({
+        'version': info['version'],
+        'upload_time': upload_time
+    })
+    return metadata
+
+def read_json_members(response, keys):
+    """Stream the requested top-level members out of a JSON response body"""
+    return read_members(response.iter_content(chunk_size=JSON_CHUNK_SIZE), keys)
+
+def fetch_release_upload_time(package_name, version):
+    """Get the upload time of one release from the per-version endpoint.
+
+    That document only lists the release's own files, so it stays small
+    no matter how long the project's release history is. It is read in
+    full so the connection goes back to the pool.
+    """
+    url = Config.PYPI_RELEASE_URL.format(package=package_name, version=version)
+    response = pypi_client.get(url)
+    response.raise_for_status()
+    urls = read_members([response.content], ['urls']).get('urls') or [{}]
+    return urls[0].get('upload_time', '')
+
+def fetch_package_metadata(package_name):
+    """Get package metadata, going to PyPI only when the cached copy is stale.
+
+    Stale entries are revalidated with a conditional GET, so an unchanged
+    package costs a 304 instead of the full project JSON. If PyPI cannot be
+    reached, the stale entry is served instead of failing.
+
+    The project JSON is streamed and only its ``info`` member is decoded;
+    the connection is dropped once ``info`` has been read, so the
+    ``releases`` history of large projects is neither downloaded in full
+    nor parsed. The upload time comes from the small per-version document,
+    and only when the version differs from the cached one.
+    """
+    entry = metadata_cache.load(package_name)
+    if metadata_cache.is_fresh(entry):
+        logger.debug(f"Using cached metadata for {package_name}")
+        return entry['metadata']
+
+    url = Config.PYPI_API_URL.format(package=package_name)
+    logger.debug(f"Making request to: {url}")
+    try:
+        with pypi_client.get(url, stream=True,
+                             headers=metadata_cache.conditional_headers(entry)) as response:
+            if response.status_code == 304 and entry:
+                # Drain the empty body so the connection is reused, not closed
+                response.content
+                logger.info(f"Metadata for {package_name} not modified")
+                return metadata_cache.touch(entry, package_name)['metadata']
+            response.raise_for_status()
+            info = read_json_members(response, ['info'])['info']
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+
+        cached = entry['metadata'] if entry else {}
+        if cached.get('version') == info['version'] and cached.get('upload_time'):
+            upload_time = cached['upload_time']
+        else:
+            upload_time = fetch_release_upload_time(package_name, info['version'])
+        metadata = extract_metadata(info, upload_time)
+    except requests.RequestException as e:
+        if entry:
+            logger.warning(f"Request error for {package_name}, serving cached metadata: {str(e)}")
+            return entry['metadata']
+        raise
+
+    return metadata_cache.store(
+        package_name,
+        metadata,
+        etag=etag,
+        last_modified=last_modified
+    )['metadata']
+
 def get_package_info(package_name):
     """Get package information from PyPI"""
     logger.info(f"Fetching info for package: {package_name}")
     try:
-        url = f"https://pypi.org/pypi/{package_name}/json"
-        logger.debug(f"Making request to: {url}")
-        
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        
-        data = response.json()
-        info = data['info']
-        releases = data['releases']
-        
-        # Get latest version info
-        latest_version = info['version']
-        latest_release = releases.get(latest_version, [{}])[0]
+        metadata = fetch_package_metadata(package_name)
+        latest_version = metadata['version']
         
         logger.info(f"Latest version for {package_name}: {latest_version}")
         
-        # Convert upload time to EST
-        upload_time = latest_release.get('upload_time', '')
+        # Keep the upload time as an aware UTC datetime; it is only
+        # converted to the display timezone when rendered
+        upload_time = metadata.get('upload_time', '')
         if upload_time:
-            # Parse the upload time
-            upload_time = datetime.strptime(upload_time, '%Y-%m-%dT%H:%M:%S')
-            # Convert to EST timezone
-            est = pytz.timezone('America/New_York')
-            upload_time = pytz.utc.localize(upload_time).astimezone(est)
-            # Format in desired format with EST
-            formatted_time = f"{upload_time.strftime('%Y-%m-%d %H:%M:%S')} EST"
+            updated_at = datetime.fromisoformat(upload_time).replace(tzinfo=pytz.UTC)
         else:
-            upload_time = datetime.now(pytz.UTC)
-            est = pytz.timezone('America/New_York')
-            upload_time = upload_time.astimezone(est)
-            formatted_time = f"{upload_time.strftime('%Y-%m-%d %H:%M:%S')} EST"
+            updated_at = datetime.now(pytz.UTC)
             logger.warning(f"No upload time found for {package_name}, using current time")
         
         package_info = {
             'name': package_name,
             'version': latest_version,
-            'last_update': formatted_time,
-            'status': get_package_status(upload_time),
+            'updated_at': updated_at,
+            'status': get_package_status(updated_at),
             'has_update': False,
             'link': f"https://pypi.org/project/{package_name}/",
-            'description': info.get('summary', 'No description available'),
-            'author': info.get('author', 'Unknown'),
-            'license': info.get('license', 'Not specified'),
-            'home_page': info.get('home_page', ''),
-            'requires_python': info.get('requires_python', 'Not specified')
+            'description': metadata.get('summary', 'No description available'),
+            'author': metadata.get('author', 'Unknown'),
+            'license': metadata.get('license', 'Not specified'),
+            'home_page': metadata.get('home_page', ''),
+            'requires_python': metadata.get('requires_python', 'Not specified')
         }
         
         logger.debug(f"Package info for {package_name}: {package_info}")
@@ -191,14 +414,36 @@ def get_package_status(update_time):
 
 @package_bp.route('/api/check_package_versions', methods=['GET'])
 def check_package_versions():
-    """API endpoint for checking package versions"""
+    """API endpoint for checking package versions.
+
+    Query parameters: ``page``, ``per_page``, ``sort`` (last_update, name
+    or status, prefixed with ``-`` to reverse), ``status``, ``q`` (name
+    search) and ``refresh=true`` to rebuild the snapshot first.
+    """
     try:
-        packages = []
-        for package_name in MONITORED_PACKAGES:
-            package_info = get_package_info(package_name)
-            if package_info:
-                packages.append(package_info)
-        return jsonify({'packages': packages})
+        refresh = request.args.get('refresh', 'false').lower() == 'true'
+        snapshot = get_package_snapshot(refresh=refresh)
+        if snapshot is None:
+            return jsonify({'error': 'Package information is not available yet'}), 503
+        try:
+            result = query_packages(
+                snapshot,
+                page=request.args.get('page', 1, type=int),
+                per_page=request.args.get('per_page', type=int),
+                sort=request.args.get('sort', 'last_update'),
+                status=request.args.get('status'),
+                search=request.args.get('q')
+            )
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        result['packages'] = [serialize_package(p) for p in result['packages']]
+        result.update({
+            'errors': snapshot['errors'],
+            'status_counts': snapshot['status_counts'],
+            'total_packages': snapshot['total_packages'],
+            'generated_at': snapshot['generated_at']
+        })
+        return jsonify(result)
     except Exception as e:
         logger.error(f"API error: {str(e)}")
         return jsonify({'error': str(e)}), 500
@@ -207,17 +452,20 @@ def check_package_versions():
 def get_notifications():
     """API endpoint for notifications"""
     try:
-        notifications = []
-        for package_name in MONITORED_PACKAGES:
-            package_info = get_package_info(package_name)
-            if package_info and package_info.get('has_update'):
-                notifications.append({
-                    'type': 'info',
-                    'message': f"Update available for {package_name}: {package_info['version']}",
-                    'package_name': package_name,
-                    'timestamp': datetime.now(pytz.UTC).isoformat()
-                })
+        notifications = version_store.notifications(limit=Config.PACKAGE_NOTIFICATION_LIMIT)
         return jsonify({'notifications': notifications})
     except Exception as e:
         logger.error(f"Notifications API error: {str(e)}")
         return jsonify({'error': str(e)}), 500
+
+@package_bp.route('/api/http_status', methods=['GET'])
+def http_status():
+    """API endpoint for outbound PyPI connection and latency metrics"""
+    try:
+        return jsonify({
+            'pypi': pypi_client.stats(),
+            'last_refresh_seconds': package_monitor.last_refresh_seconds
+        })
+    except Exception as e:
+        logger.error(f"HTTP status API error: {str(e)}")
+        return jsonify({'error': str(e)}), 500
@@ -1,11 +1,13 @@
-import os
+import json
 import logging
-import pandas as pd
 import plotly.graph_objects as go
 from dash import Dash, dcc, html, Input, Output
 from datetime import datetime, time
-from flask import Blueprint, render_template, current_app
+from flask import Blueprint, render_template, current_app, has_request_context
 from typing import Dict, List, Optional
+from config import Config
+from app.utils.trend_data import TrendDataProvider
+from app.utils.cache import cache
 
 # Initialize Blueprint and logger
 bp = Blueprint('trend', __name__)
@@ -55,38 +57,8 @@ def trend() -> str:
                              error_title='Trend Analysis Error',
                              error='Failed to load trend analysis'), 500
 
-def process_data(csv_path: str) -> pd.DataFrame:
-    """
-    Process the CSV file containing DAG execution data.
-    Args:
-        csv_path: Path to the CSV file
-    Returns:
-        Processed DataFrame
-    """
-    try:
-        logger.info(f"Reading data from {csv_path}")
-        if not os.path.exists(csv_path):
-            logger.error(f"CSV file not found at {csv_path}")
-            return pd.DataFrame()
-
-        df = pd.read_csv(csv_path)
-        df['exe_date'] = pd.to_datetime(df['exe_date'], format='%d-%m-%Y')
-        df['max_batch_end_dt'] = pd.to_datetime(df['max_batch_end_dt'], format='%d-%m-%Y %H:%M')
-        df['end_time'] = df['max_batch_end_dt'].dt.time
-        df['end_hour_float'] = df['max_batch_end_dt'].dt.hour + df['max_batch_end_dt'].dt.minute/60
-
-        logger.info(f"Successfully processed {len(df)} records")
-        return df
-    except Exception as e:
-        logger.error(f"Error processing data: {str(e)}", exc_info=True)
-        return pd.DataFrame()
-
-# Initialize DataFrame
-df = process_data('dag_data.csv')
-
-# Get unique dates for x-axis
-unique_dates = sorted(df['exe_date'].unique())
-date_strings = [d.strftime('%d-%m-%y') for d in unique_dates]
+# Trend dataset, loaded on first use and reloaded when the data file changes
+trend_data = TrendDataProvider(Config.TREND_DATA_PATH, check_interval=Config.TREND_RELOAD_INTERVAL)
 
 # Define time intervals for y-axis
 time_intervals = [
@@ -95,6 +67,13 @@ time_intervals = [
 ]
 time_labels = [t.strftime('%H:%M') for t in time_intervals[:-1]] + ['24:00']
 
+# X-axis title for each aggregation level
+AXIS_TITLES = {
+    'daily': 'Execution Date',
+    'weekly': 'Execution Week (max end time)',
+    'monthly': 'Execution Month (max end time)'
+}
+
 # Define thresholds for each application
 thresholds = {
     'east': 7 + 0/60,  # 7:00 AM
@@ -103,60 +82,107 @@ thresholds = {
     'west': 21 + 0/60  # 21:00
 }
 
-layout = html.Div(className='main-container', children=[
-    # Dropdowns Container
-    html.Div(className='dropdown-container backdrop-blur-sm bg-white/80 rounded-xl shadow-lg p-4 border border-blue-100', children=[
-        html.Div([
-            html.Label(
-                'Select Application:', 
-                className='block text-sm font-semibold text-gray-700 mb-2'
-            ),
-            html.Div(
-                dcc.Dropdown(
-                    id='app-dropdown',
-                    options=[{'label': 'All Applications', 'value': 'all'}] +
-                            [{'label': app, 'value': app} for app in df['application_name'].unique()],
-                    value='all',
-                    clearable=False,
-                    className='dash-dropdown'
+def serve_layout() -> html.Div:
+    """
+    Build the Dash layout.
+    Called on every page load, so the application list follows data reloads.
+    """
+    # Dash also calls this once at startup, outside a request, to validate
+    # component ids; skip loading the data for that
+    dataset = trend_data.get() if has_request_context() else None
+    applications = dataset.applications if dataset else []
+    first_date = dataset.first_date.strftime('%Y-%m-%d') if dataset and dataset.first_date else None
+    last_date = dataset.last_date.strftime('%Y-%m-%d') if dataset and dataset.last_date else None
+    return html.Div(className='main-container', children=[
+        # Dropdowns Container
+        html.Div(className='dropdown-container backdrop-blur-sm bg-white/80 rounded-xl shadow-lg p-4 border border-blue-100', children=[
+            html.Div([
+                html.Label(
+                    'Select Application:', 
+                    className='block text-sm font-semibold text-gray-700 mb-2'
                 ),
-                className='relative'
-            )
-        ], className='w-[48%] inline-block'),
+                html.Div(
+                    dcc.Dropdown(
+                        id='app-dropdown',
+                        options=[{'label': 'All Applications', 'value': 'all'}] +
+                                [{'label': app, 'value': app} for app in applications],
+                        value='all',
+                        clearable=False,
+                        className='dash-dropdown'
+                    ),
+                    className='relative'
+                )
+            ], className='w-[48%] inline-block'),
         
-        html.Div([
-            html.Label(
-                'Select DAG:', 
-                className='block text-sm font-semibold text-gray-700 mb-2'
-            ),
-            html.Div(
-                dcc.Dropdown(
-                    id='dag-dropdown',
-                    options=[],
-                    clearable=False,
-                    className='dash-dropdown'
+            html.Div([
+                html.Label(
+                    'Select DAG:', 
+                    className='block text-sm font-semibold text-gray-700 mb-2'
                 ),
-                className='relative'
-            )
-        ], 
-        className='w-[48%] inline-block ml-[4%]',
-        id='dag-dropdown-container',
-        style={'visibility': 'hidden'})
-    ]),
+                html.Div(
+                    dcc.Dropdown(
+                        id='dag-dropdown',
+                        options=[],
+                        clearable=False,
+                        className='dash-dropdown'
+                    ),
+                    className='relative'
+                )
+            ], 
+            className='w-[48%] inline-block ml-[4%]',
+            id='dag-dropdown-container',
+            style={'visibility': 'hidden'}),
+
+            html.Div([
+                html.Label(
+                    'Date Range:', 
+                    className='block text-sm font-semibold text-gray-700 mb-2'
+                ),
+                dcc.DatePickerRange(
+                    id='date-range',
+                    min_date_allowed=first_date,
+                    max_date_allowed=last_date,
+                    start_date=None,
+                    end_date=None,
+                    display_format='DD-MM-YY',
+                    clearable=True
+                )
+            ], className='w-[48%] inline-block mt-4'),
+
+            html.Div([
+                html.Label(
+                    'Aggregation:', 
+                    className='block text-sm font-semibold text-gray-700 mb-2'
+                ),
+                dcc.RadioItems(
+                    id='aggregation-level',
+                    options=[
+                        {'label': 'Auto', 'value': 'auto'},
+                        {'label': 'Daily', 'value': 'daily'},
+                        {'label': 'Weekly', 'value': 'weekly'},
+                        {'label': 'Monthly', 'value': 'monthly'}
+                    ],
+                    value='auto',
+                    inline=True,
+                    inputClassName='mr-1',
+                    labelClassName='mr-4 text-sm text-gray-700'
+                )
+            ], className='w-[48%] inline-block ml-[4%] mt-4')
+        ]),
     
-    # Graph Container
-    html.Div(className='graph-container backdrop-blur-sm bg-white/80 rounded-xl shadow-lg p-4 border border-blue-100', children=[
-        dcc.Graph(
-            id='time-series-graph',
-            config={
-                'displayModeBar': True,
-                'displaylogo': False,
-                'modeBarButtonsToRemove': ['lasso2d', 'select2d'],
-                'responsive': True
-            }
-        )
+        # Graph Container
+        html.Div(className='graph-container backdrop-blur-sm bg-white/80 rounded-xl shadow-lg p-4 border border-blue-100', children=[
+            dcc.Graph(
+                id='time-series-graph',
+                config={
+                    'displayModeBar': True,
+                    'displaylogo': False,
+                    'modeBarButtonsToRemove': ['lasso2d', 'select2d'],
+                    'responsive': True
+                }
+            )
+        ])
     ])
-])
 
 def init_dash(server) -> Dash:
     """
@@ -176,7 +202,7 @@ def init_dash(server) -> Dash:
             index_string=index_string
         )
 
-        app.layout = layout
+        app.layout = serve_layout
         register_callbacks(app)
         
         logger.info("Dash app initialized successfully")
@@ -185,6 +211,131 @@ def init_dash(server) -> Dash:
         logger.error(f"Error initializing Dash app: {str(e)}", exc_info=True)
         raise
 
+def build_figure(dataset, selected_app: str, selected_dag: Optional[str],
+                 start_date: Optional[str] = None, end_date: Optional[str] = None,
+                 level: str = 'auto') -> go.Figure:
+    """
+    Build the trend figure for a selection.
+    Args:
+        dataset: TrendDataset to plot
+        selected_app: Application name or 'all'
+        selected_dag: DAG name, ignored for 'all'
+        start_date, end_date: Inclusive date range, None for open ends
+        level: 'auto', 'daily', 'weekly' or 'monthly'; coarsened when the
+            range holds more than TREND_MAX_POINTS points
+    Returns:
+        Plotly figure
+    """
+    # Daily maximum end times, precomputed when the data was loaded,
+    # windowed and aggregated so the point count stays bounded
+    trace = dataset.trace_arrays(selected_app, selected_dag, start_date, end_date,
+                                 level, max_points=Config.TREND_MAX_POINTS)
+    if not len(trace['x']):
+        logger.warning("No data available for the selected filters")
+        return go.Figure()
+
+    fig = go.Figure()
+
+    # Add trace
+    fig.add_trace(go.Scatter(
+        x=trace['x'],
+        y=trace['y'],
+        mode='lines+markers',
+        name='Max Batch End Time',
+        line=dict(color='#017cee', width=2),
+        marker=dict(
+            size=10,
+            symbol='circle',
+            line=dict(color='#fff', width=2)
+        ),
+        hovertemplate=(
+            'Date: %{x}<br>' +
+            'Time: %{text}<br>' +
+            'DAG: %{customdata[0]}<br>' +
+            'Batch: %{customdata[1]}<br>' +
+            '<extra></extra>'
+        ),
+        text=trace['text'],
+        customdata=trace['customdata']
+    ))
+
+    # Update layout
+    fig.update_layout(
+        autosize=True,
+        margin=dict(l=60, r=20, t=40, b=100),
+        xaxis=dict(
+            title=AXIS_TITLES[trace['level']],
+            gridcolor='#e0e0e0',
+            showgrid=True,
+            tickangle=90,
+            type='category',
+            tickfont=dict(size=12)
+        ),
+        yaxis=dict(
+            title='Time of Day',
+            ticktext=time_labels,
+            tickvals=[0, 3, 6, 9, 12, 15, 18, 21, 24],
+            gridcolor='#e0e0e0',
+            showgrid=True,
+            range=[-0.5, 24.5],
+            tickfont=dict(size=12)
+        ),
+        plot_bgcolor='white',
+        paper_bgcolor='white',
+        hovermode='x unified',
+        showlegend=False
+    )
+
+    # Add horizontal lines for hours
+    for hour in [0, 3, 6, 9, 12, 15, 18, 21, 24]:
+        fig.add_hline(
+            y=hour,
+            line=dict(color='#e0e0e0', width=1, dash='dash'),
+            opacity=0.7
+        )
+
+    # Add threshold line if applicable
+    if selected_app != 'all' and selected_app in thresholds:
+        fig.add_hline(
+            y=thresholds[selected_app],
+            line=dict(color='red', width=2, dash='dash'),
+            annotation_text=f'Threshold: {time(int(thresholds[selected_app]), int((thresholds[selected_app] % 1) * 60)).strftime("%H:%M")}',
+            annotation_position='top left'
+        )
+
+    return fig
+
+def figure_cache_key(version: str, selected_app: str, selected_dag: Optional[str],
+                     start_date: Optional[str] = None, end_date: Optional[str] = None,
+                     level: str = 'auto') -> str:
+    """Cache key of a figure; includes the dataset version so reloads invalidate it"""
+    if selected_app == 'all':
+        selected_dag = None
+    # Date pickers may send a time part; only the date matters
+    start_date = (start_date or '')[:10]
+    end_date = (end_date or '')[:10]
+    return (f"trend_figure:{version}:{selected_app}:{selected_dag or ''}:"
+            f"{start_date}:{end_date}:{level}")
+
+def get_figure(selected_app: str, selected_dag: Optional[str],
+               start_date: Optional[str] = None, end_date: Optional[str] = None,
+               level: str = 'auto'):
+    """
+    Return the serialized figure for a selection from the shared cache,
+    building and caching it on a miss. Entries of replaced dataset versions
+    are never read again and age out of the bounded cache.
+    """
+    dataset = trend_data.get()
+    key = figure_cache_key(dataset.version, selected_app, selected_dag, start_date, end_date, level)
+    cached = cache.get(key)
+    if cached is not None:
+        logger.debug(f"Serving cached figure {key}")
+        return json.loads(cached)
+
+    fig = build_figure(dataset, selected_app, selected_dag, start_date, end_date, level)
+    cache.set(key, fig.to_json(), timeout=Config.TREND_FIGURE_CACHE_TIMEOUT)
+    return fig
+
 def register_callbacks(app: Dash) -> None:
     """
     Register callbacks for the Dash application.
@@ -209,110 +360,29 @@ def register_callbacks(app: Dash) -> None:
             if selected_app == 'all':
                 return [], {**base_style, 'visibility': 'hidden'}
             
-            filtered_df = df[df['application_name'] == selected_app]
+            dags = trend_data.get().dags_for(selected_app)
             return (
-                [{'label': dag, 'value': dag} for dag in filtered_df['dag_name'].unique()],
+                [{'label': dag, 'value': dag} for dag in dags],
                 {**base_style, 'visibility': 'visible'}
             )
 
         @app.callback(
             Output('time-series-graph', 'figure'),
             [Input('app-dropdown', 'value'),
-             Input('dag-dropdown', 'value')]
+             Input('dag-dropdown', 'value'),
+             Input('date-range', 'start_date'),
+             Input('date-range', 'end_date'),
+             Input('aggregation-level', 'value')]
         )
-        def update_graph(selected_app: str, selected_dag: Optional[str]) -> go.Figure:
-            """Update graph based on selected application and DAG"""
-            logger.info(f"Updating graph for app: {selected_app}, dag: {selected_dag}")
+        def update_graph(selected_app: str, selected_dag: Optional[str],
+                         start_date: Optional[str], end_date: Optional[str],
+                         level: Optional[str]) -> go.Figure:
+            """Update graph based on selected application, DAG, date range and aggregation"""
+            logger.info(f"Updating graph for app: {selected_app}, dag: {selected_dag}, "
+                        f"range: {start_date} - {end_date}, level: {level}")
             
             try:
-                # Filter data based on selections
-                if selected_app == 'all':
-                    filtered_df = df
-                else:
-                    filtered_df = df[df['application_name'] == selected_app]
-                    if selected_dag:
-                        filtered_df = filtered_df[filtered_df['dag_name'] == selected_dag]
-
-                if filtered_df.empty:
-                    logger.warning("No data available for the selected filters")
-                    return go.Figure()
-
-                # Get daily maximum values
-                daily_max_indices = filtered_df.groupby('exe_date')['end_hour_float'].idxmax()
-                daily_max = filtered_df.loc[daily_max_indices].reset_index(drop=True)
-
-                fig = go.Figure()
-
-                # Add trace
-                fig.add_trace(go.Scatter(
-                    x=[d.strftime('%d-%m-%y') for d in daily_max['exe_date']],
-                    y=daily_max['end_hour_float'],
-                    mode='lines+markers',
-                    name='Max Batch End Time',
-                    line=dict(color='#017cee', width=2),
-                    marker=dict(
-                        size=10,
-                        symbol='circle',
-                        line=dict(color='#fff', width=2)
-                    ),
-                    hovertemplate=(
-                        'Date: %{x}<br>' +
-                        'Time: %{text}<br>' +
-                        'DAG: %{customdata[0]}<br>' +
-                        'Batch: %{customdata[1]}<br>' +
-                        '<extra></extra>'
-                    ),
-                    text=[t.strftime('%H:%M') for t in daily_max['max_batch_end_dt']],
-                    customdata=list(zip(daily_max['dag_name'], daily_max['batch_name']))
-                ))
-
-                # Update layout
-                fig.update_layout(
-                    autosize=True,
-                    margin=dict(l=60, r=20, t=40, b=100),
-                    xaxis=dict(
-                        title='Execution Date',
-                        gridcolor='#e0e0e0',
-                        showgrid=True,
-                        ticktext=date_strings,
-                        tickvals=date_strings,
-                        tickangle=90,
-                        tickmode='array',
-                        type='category',
-                        tickfont=dict(size=12)
-                    ),
-                    yaxis=dict(
-                        title='Time of Day',
-                        ticktext=time_labels,
-                        tickvals=[0, 3, 6, 9, 12, 15, 18, 21, 24],
-                        gridcolor='#e0e0e0',
-                        showgrid=True,
-                        range=[-0.5, 24.5],
-                        tickfont=dict(size=12)
-                    ),
-                    plot_bgcolor='white',
-                    paper_bgcolor='white',
-                    hovermode='x unified',
-                    showlegend=False
-                )
-
-                # Add horizontal lines for hours
-                for hour in [0, 3, 6, 9, 12, 15, 18, 21, 24]:
-                    fig.add_hline(
-                        y=hour,
-                        line=dict(color='#e0e0e0', width=1, dash='dash'),
-                        opacity=0.7
-                    )
-
-                # Add threshold line if applicable
-                if selected_app != 'all' and selected_app in thresholds:
-                    fig.add_hline(
-                        y=thresholds[selected_app],
-                        line=dict(color='red', width=2, dash='dash'),
-                        annotation_text=f'Threshold: {time(int(thresholds[selected_app]), int((thresholds[selected_app] % 1) * 60)).strftime("%H:%M")}',
-                        annotation_position='top left'
-                    )
-
+                fig = get_figure(selected_app, selected_dag, start_date, end_date, level or 'auto')
                 logger.info("Graph updated successfully")
                 return fig
             except Exception as e:
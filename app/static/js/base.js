@@ -189,7 +189,7 @@ export const utils = {
         const lastRefreshElement = document.getElementById('lastRefreshTime');
         if (lastRefreshElement) {
             const time = moment().tz('America/New_York');
-            lastRefreshElement.textContent = time.format('HH:mm:ss') + ' EST';
+            lastRefreshElement.textContent = time.format('HH:mm:ss z');
         }
     },
 
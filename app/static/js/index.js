@@ -42,11 +42,13 @@ document.addEventListener('DOMContentLoaded', function() {
         handleSelectAll({ target: { checked: true } });
     }
 
-    // Load initial data
-    refreshData();
-    
-    // Set up automatic refresh interval
-    setInterval(refreshData, refreshInterval);
+    // Follow live updates when the browser supports them, otherwise poll
+    if (window.EventSource) {
+        connectStatusStream();
+    } else {
+        refreshData();
+        setInterval(refreshData, refreshInterval);
+    }
 
     // Set up error handling
     window.addEventListener('unhandledrejection', function(event) {
@@ -219,21 +221,11 @@ function updateSelectAllCheckbox() {
 }
 
 // Refresh all data
-function refreshData() {
+async function refreshData() {
     showLoading();
     try {
-        const now = new Date();
-        const lastRefreshElement = document.getElementById('lastRefreshTime');
-        if (lastRefreshElement) {
-            lastRefreshElement.textContent = now.toLocaleTimeString();
-        }
-        
-        document.querySelectorAll('.subject-card').forEach(card => {
-            const subject = sanitizeHTML(card.dataset.subject);
-            if (subject) {
-                updateSubjectStatusCounts(subject);
-            }
-        });
+        await updateStatusCounts();
+        updateLastRefreshTime();
     } catch (error) {
         console.error('Error refreshing data:', error);
         showError('Failed to refresh data');
@@ -242,31 +234,63 @@ function refreshData() {
     }
 }
 
+// Show when the counts were last refreshed
+function updateLastRefreshTime() {
+    const lastRefreshElement = document.getElementById('lastRefreshTime');
+    if (lastRefreshElement) {
+        lastRefreshElement.textContent = new Date().toLocaleTimeString();
+    }
+}
+
 // Handle refresh button click
 function handleRefreshClick() {
     refreshData();
 }
 
-// Update status counts for a subject
-async function updateSubjectStatusCounts(subject) {
-    const statuses = ['success', 'running', 'failed', 'yet_to_start'];
-    
-    for (const status of statuses) {
-        try {
-            const response = await fetch(`/dag_status?subject_area=${encodeURIComponent(subject)}&status=${encodeURIComponent(status)}`);
-            if (!response.ok) {
-                throw new Error(`HTTP error! status: ${response.status}`);
-            }
-            const data = await response.json();
-            
-            const countElement = document.getElementById(`${sanitizeHTML(subject)}_${sanitizeHTML(status)}_count`);
+// Update status counts for all subjects from a single summary request
+async function updateStatusCounts() {
+    const response = await fetch('/dag_status/summary');
+    if (!response.ok) {
+        throw new Error(`HTTP error! status: ${response.status}`);
+    }
+    const data = await response.json();
+    if (data.error) {
+        throw new Error(data.error);
+    }
+
+    applyStatusCounts(data.subjects || {});
+}
+
+// Follow status count changes pushed by the server
+function connectStatusStream() {
+    const source = new EventSource('/dag_status/stream');
+    const handleCounts = event => {
+        const data = JSON.parse(event.data);
+        applyStatusCounts(data.subjects || {});
+        updateLastRefreshTime();
+    };
+
+    source.addEventListener('summary', handleCounts);
+    source.addEventListener('update', handleCounts);
+    source.addEventListener('resync', () => refreshData());
+    source.onerror = () => {
+        // EventSource reconnects on its own and receives a fresh summary
+        console.warn('Status stream interrupted, reconnecting...');
+    };
+}
+
+// Write per-status counts into the subject area cards
+function applyStatusCounts(subjects) {
+    Object.entries(subjects).forEach(([subject, counts]) => {
+        if (!counts) return;
+        const subjectId = subject.replace(/ /g, '_');
+        Object.entries(counts).forEach(([status, count]) => {
+            const countElement = document.getElementById(`${subjectId}_${status}_count`);
             if (countElement) {
-                countElement.textContent = data.length.toString();
+                countElement.textContent = count.toString();
             }
-        } catch (error) {
-            console.error(`Error fetching ${status} status for ${subject}:`, error);
-        }
-    }
+        });
+    });
 }
 
 // Utility Functions
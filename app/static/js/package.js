@@ -1,7 +1,20 @@
 const packageParser = {
+    // Current page and filters; the first page is rendered by the server
+    state: {
+        page: 1,
+        perPage: null,
+        sort: 'last_update',
+        status: '',
+        query: ''
+    },
+
     init() {
+        const packageList = document.querySelector('.package-list');
+        if (packageList && packageList.dataset.perPage) {
+            this.state.perPage = parseInt(packageList.dataset.perPage, 10);
+        }
         this.setupEventListeners();
-        this.loadInitialPackages(); // Changed to separate initial load function
+        this.loadInitialPackages();
         this.formatAllTimestamps();
         this.setupNotificationRefresh();
     },
@@ -13,47 +26,114 @@ const packageParser = {
             refreshBtn.addEventListener('click', () => this.refreshPackages());
         }
 
-        // Package search handler
+        // Package search handler, debounced since every search is a server query
         const searchInput = document.getElementById('packageSearch');
         if (searchInput) {
-            searchInput.addEventListener('input', (e) => this.filterPackages(e.target.value));
+            let searchTimer = null;
+            searchInput.addEventListener('input', (e) => {
+                clearTimeout(searchTimer);
+                searchTimer = setTimeout(() => {
+                    this.state.query = e.target.value.trim();
+                    this.loadPackages(true);
+                }, 300);
+            });
+        }
+
+        const statusFilter = document.getElementById('statusFilter');
+        if (statusFilter) {
+            statusFilter.addEventListener('change', (e) => {
+                this.state.status = e.target.value;
+                this.loadPackages(true);
+            });
+        }
+
+        const sortSelect = document.getElementById('packageSort');
+        if (sortSelect) {
+            sortSelect.addEventListener('change', (e) => {
+                this.state.sort = e.target.value;
+                this.loadPackages(true);
+            });
+        }
+
+        const loadMoreBtn = document.getElementById('loadMoreBtn');
+        if (loadMoreBtn) {
+            loadMoreBtn.addEventListener('click', () => this.loadPackages());
         }
     },
 
     async loadInitialPackages() {
+        // The server renders the first page; only fetch it if that failed
+        if (document.querySelector('.package-card')) return;
+        await this.loadPackages(true);
+    },
+
+    buildQuery(params = {}) {
+        const query = new URLSearchParams({ sort: this.state.sort, ...params });
+        if (this.state.perPage && !query.has('per_page')) query.set('per_page', this.state.perPage);
+        if (this.state.status) query.set('status', this.state.status);
+        if (this.state.query) query.set('q', this.state.query);
+        return query.toString();
+    },
+
+    async loadPackages(reset = false) {
+        const page = reset ? 1 : this.state.page + 1;
+        const loadMoreBtn = document.getElementById('loadMoreBtn');
+        if (loadMoreBtn) loadMoreBtn.disabled = true;
+
         try {
-            const response = await fetch('/api/check_package_versions');
+            const response = await fetch(`/api/check_package_versions?${this.buildQuery({ page })}`);
             if (!response.ok) throw new Error('Failed to fetch package updates');
-            
+
             const data = await response.json();
-            this.renderInitialPackages(data.packages);
+            this.state.page = data.page;
+            this.state.perPage = data.per_page;
+            this.renderPackages(data.packages, reset);
+            this.updatePagination(data);
             this.updateLastChecked();
         } catch (error) {
-            console.error('Error loading initial packages:', error);
+            console.error('Error loading packages:', error);
             // Only show notification if no packages are visible
             if (!document.querySelector('.package-card')) {
                 this.showNotification('Failed to load packages', 'danger');
             }
+        } finally {
+            if (loadMoreBtn) loadMoreBtn.disabled = false;
         }
     },
-    
 
-    renderInitialPackages(packages) {
+    renderPackages(packages, reset = false) {
         if (!packages || !Array.isArray(packages)) return;
 
         const packageList = document.querySelector('.package-list');
         if (!packageList) return;
 
-        // Clear existing content
-        packageList.innerHTML = '';
+        if (reset) packageList.innerHTML = '';
 
-        // Create and append package cards
-        packages.forEach(pkg => {
-            const card = this.createPackageCard(pkg);
-            packageList.appendChild(card);
-        });
+        // Build the page off-DOM and insert it in one go
+        const fragment = document.createDocumentFragment();
+        packages.forEach(pkg => fragment.appendChild(this.createPackageCard(pkg)));
+        fragment.querySelectorAll('.last-update').forEach(el => this.formatTimestamp(el));
+        packageList.appendChild(fragment);
+    },
+
+    updatePagination(data) {
+        const loaded = document.querySelectorAll('.package-card').length;
+
+        const loadMoreBtn = document.getElementById('loadMoreBtn');
+        if (loadMoreBtn) {
+            loadMoreBtn.style.display = data.has_more ? 'inline-block' : 'none';
+        }
 
-        this.sortPackageCards();
+        const countLabel = document.getElementById('packageCountLabel');
+        if (countLabel) {
+            countLabel.textContent = `(${loaded} of ${data.total})`;
+        }
+
+        const noResultsElement = document.getElementById('noPackagesFound');
+        if (noResultsElement) {
+            const filtered = this.state.query || this.state.status;
+            noResultsElement.style.display = filtered && data.total === 0 ? 'block' : 'none';
+        }
     },
 
     createPackageCard(pkg) {
@@ -88,7 +168,7 @@ const packageParser = {
                             <div class="version-info">
                                 <i class="fas fa-clock text-primary"></i>
                                 <strong>Last Updated:</strong>
-                                <span class="last-update" data-timestamp="${pkg.last_update}">${pkg.last_update}</span>
+                                <span class="last-update" data-timestamp="${pkg.last_update}">${pkg.last_update_display || pkg.last_update}</span>
                             </div>
                         </div>
                         <div class="col-12">
@@ -119,13 +199,20 @@ const packageParser = {
         }
 
         try {
-            const response = await fetch('/api/check_package_versions');
+            // Re-fetch everything loaded so far in one request
+            const loaded = document.querySelectorAll('.package-card').length;
+            const perPage = Math.max(loaded, this.state.perPage || 0) || '';
+            const query = this.buildQuery({ refresh: 'true', page: 1, per_page: perPage });
+            const response = await fetch(`/api/check_package_versions?${query}`);
             if (!response.ok) throw new Error('Failed to fetch package updates');
             
             const data = await response.json();
             this.updatePackageCards(data.packages);
+            if (this.state.perPage) {
+                this.state.page = Math.max(1, Math.ceil(data.packages.length / this.state.perPage));
+            }
+            this.updatePagination({ ...data, has_more: data.packages.length < data.total });
             this.updateLastChecked();
-            this.sortPackageCards();
             this.showNotification('Package information updated successfully', 'success');
         } catch (error) {
             console.error('Error refreshing packages:', error);
@@ -138,37 +225,31 @@ const packageParser = {
         }
     },
 
-    sortPackageCards() {
+    updatePackageCards(packages) {
+        if (!packages || !Array.isArray(packages)) return;
+
         const packageList = document.querySelector('.package-list');
         if (!packageList) return;
 
-        const cards = Array.from(packageList.getElementsByClassName('package-card'));
-        if (cards.length === 0) return;
-
-        cards.sort((a, b) => {
-            const timeA = new Date(a.getAttribute('data-timestamp'));
-            const timeB = new Date(b.getAttribute('data-timestamp'));
-            return timeB - timeA; // Sort in descending order (newest first)
+        const existing = new Map();
+        packageList.querySelectorAll('.package-card').forEach(card => {
+            existing.set(card.getAttribute('data-package'), card);
         });
 
-        // Clear and reappend in sorted order
-        packageList.innerHTML = '';
-        cards.forEach(card => packageList.appendChild(card));
-    },
-
-    updatePackageCards(packages) {
-        if (!packages || !Array.isArray(packages)) return;
-
+        // Update cards in place and re-append them in the server's order
         packages.forEach(pkg => {
-            const card = document.querySelector(`.package-card[data-package="${pkg.name}"]`);
+            let card = existing.get(pkg.name);
             if (card) {
                 this.updatePackageCard(card, pkg);
+                existing.delete(pkg.name);
             } else {
-                // If card doesn't exist, create it
-                const newCard = this.createPackageCard(pkg);
-                document.querySelector('.package-list').appendChild(newCard);
+                card = this.createPackageCard(pkg);
             }
+            packageList.appendChild(card);
         });
+
+        // Packages that dropped out of the loaded range
+        existing.forEach(card => card.remove());
     },
 
     updatePackageCard(card, pkg) {
@@ -193,7 +274,7 @@ const packageParser = {
 
         if (lastUpdate) {
             lastUpdate.setAttribute('data-timestamp', pkg.last_update);
-            lastUpdate.textContent = pkg.last_update;
+            lastUpdate.textContent = pkg.last_update_display || pkg.last_update;
         }
 
         // Update status badge
@@ -234,41 +315,31 @@ const packageParser = {
         }
     },
 
-    filterPackages(searchTerm) {
-        const cards = document.querySelectorAll('.package-card');
-        const noResultsElement = document.getElementById('noPackagesFound');
-        let hasVisibleCards = false;
-
-        if (cards.length === 0) {
-            if (noResultsElement) {
-                noResultsElement.style.display = 'none';
-            }
-            return;
-        }
-
-        cards.forEach(card => {
-            const packageName = card.getAttribute('data-package').toLowerCase();
-            const isVisible = packageName.includes(searchTerm.toLowerCase());
-            card.style.display = isVisible ? 'block' : 'none';
-            if (isVisible) hasVisibleCards = true;
-        });
-
-        if (noResultsElement) {
-            if (searchTerm && !hasVisibleCards) {
-                noResultsElement.textContent = 'No matching packages found.';
-                noResultsElement.style.display = 'block';
-            } else {
-                noResultsElement.style.display = 'none';
-            }
-        }
-    },
-
     formatAllTimestamps() {
         document.querySelectorAll('.last-update, .notification-time').forEach(el => 
             this.formatTimestamp(el)
         );
     },
 
+    // Shared formatter; building an Intl.DateTimeFormat per element is costly
+    timestampFormatter: new Intl.DateTimeFormat('en-US', {
+        year: 'numeric',
+        month: '2-digit',
+        day: '2-digit',
+        hour: '2-digit',
+        minute: '2-digit',
+        second: '2-digit',
+        hourCycle: 'h23',
+        timeZone: 'America/New_York',
+        timeZoneName: 'short'
+    }),
+
+    titleFormatter: new Intl.DateTimeFormat('en-US', {
+        dateStyle: 'full',
+        timeStyle: 'long',
+        timeZone: 'America/New_York'
+    }),
+
     formatTimestamp(element) {
         const timestamp = element.getAttribute('data-timestamp');
         if (!timestamp) return;
@@ -277,29 +348,17 @@ const packageParser = {
             const date = new Date(timestamp);
             if (isNaN(date.getTime())) return;
     
-            const formatter = new Intl.DateTimeFormat('en-US', {
-                year: 'numeric',
-                month: '2-digit',
-                day: '2-digit',
-                hour: '2-digit',
-                minute: '2-digit',
-                second: '2-digit',
-                hour12: false,
-                timeZone: 'America/New_York'
+            // Read the parts individually so the zone name follows DST (EST/EDT)
+            const parts = {};
+            this.timestampFormatter.formatToParts(date).forEach(({ type, value }) => {
+                parts[type] = value;
             });
-    
-            const formattedDate = formatter.format(date);
-            const [datePart, timePart] = formattedDate.split(', ');
-            const [month, day, year] = datePart.split('/');
-            const formattedTime = `${year}-${month}-${day} ${timePart} EST`;
+            const formattedTime = `${parts.year}-${parts.month}-${parts.day} ` +
+                `${parts.hour}:${parts.minute}:${parts.second} ${parts.timeZoneName}`;
             
             element.textContent = formattedTime;
             
-            element.title = new Intl.DateTimeFormat('en-US', {
-                dateStyle: 'full',
-                timeStyle: 'long',
-                timeZone: 'America/New_York'
-            }).format(date);
+            element.title = this.titleFormatter.format(date);
     
         } catch (error) {
             console.error('Error formatting timestamp:', error);
@@ -315,10 +374,11 @@ const packageParser = {
                 hour: '2-digit',
                 minute: '2-digit',
                 second: '2-digit',
-                hour12: false,
-                timeZone: 'America/New_York'
+                hourCycle: 'h23',
+                timeZone: 'America/New_York',
+                timeZoneName: 'short'
             });
-            lastCheckedElement.textContent = `${formatter.format(now)} EST`; 
+            lastCheckedElement.textContent = formatter.format(now);
         }               
     },
 
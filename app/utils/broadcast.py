@@ -0,0 +1,140 @@
+import logging
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+from flask import json
+from config import Config
+from app.utils.snapshot import dag_snapshot
+
+logger = logging.getLogger('dashboard')
+
+def format_sse(data, event=None):
+    """Format a payload as a Server-Sent Events message"""
+    message = f"event: {event}\n" if event else ''
+    return message + f"data: {json.dumps(data)}\n\n"
+
+def diff_indexes(previous, current):
+    """Return the subject/status counts and DAG rows that changed between two indexes.
+
+    Subject areas that disappeared are reported with counts of None.
+    """
+    counts = {}
+    rows = []
+
+    for subject_area, subject_counts in current.counts.items():
+        if previous.counts.get(subject_area) != subject_counts:
+            counts[subject_area] = subject_counts
+
+        old_rows = previous.grouped_data.get(subject_area, [])
+        new_rows = current.grouped_data[subject_area]
+        if old_rows is new_rows:
+            continue
+        old_records = set(old_rows)
+        rows.extend(
+            dict(record.to_json(), subject_area=subject_area)
+            for record in new_rows if record not in old_records
+        )
+
+    for subject_area in previous.counts:
+        if subject_area not in current.counts:
+            counts[subject_area] = None
+
+    return counts, rows
+
+class StatusBroadcaster:
+    """Pushes DAG status changes to Server-Sent Events subscribers.
+
+    A single background thread per process refreshes the shared snapshot
+    every ``interval`` seconds while anyone is subscribed, and sends each
+    subscriber only the counts and rows that changed. Subscribers that fall
+    more than ``queue_size`` messages behind are told to resync instead.
+    """
+
+    def __init__(self, snapshot, interval=30, queue_size=50):
+        self.snapshot = snapshot
+        self.interval = interval
+        self.queue_size = queue_size
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def subscribe(self):
+        """Register a subscriber and return the queue it should read from"""
+        subscriber = queue.Queue(maxsize=self.queue_size)
+        with self._lock:
+            self._subscribers.add(subscriber)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name='dag-status-broadcaster',
+                    daemon=True
+                )
+                self._thread.start()
+            count = len(self._subscribers)
+        logger.info("Status stream subscriber added (%d active)", count)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+            count = len(self._subscribers)
+        logger.info("Status stream subscriber removed (%d active)", count)
+
+    def subscriber_count(self):
+        with self._lock:
+            return len(self._subscribers)
+
+    def publish(self, message):
+        """Queue an already formatted SSE message for every subscriber"""
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            try:
+                subscriber.put_nowait(message)
+            except queue.Full:
+                # Drop the backlog and let the client reload the full summary
+                while True:
+                    try:
+                        subscriber.get_nowait()
+                    except queue.Empty:
+                        break
+                subscriber.put_nowait(format_sse({}, event='resync'))
+
+    def _run(self):
+        previous = self.snapshot.peek()
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                if not self._subscribers:
+                    self._thread = None
+                    logger.info("No status stream subscribers left, stopping broadcaster")
+                    return
+
+            try:
+                current = self.snapshot.refresh()
+                if current is None or current is previous:
+                    continue
+                if previous is None:
+                    # Subscribers start from the summary sent on connect
+                    previous = current
+                    continue
+                counts, rows = diff_indexes(previous, current)
+                previous = current
+
+                if counts or rows:
+                    self.publish(format_sse({
+                        'subjects': counts,
+                        'rows': rows,
+                        'generated_at': datetime.now(timezone.utc).isoformat()
+                    }, event='update'))
+                    logger.info("Broadcast %d changed subject areas and %d changed rows",
+                               len(counts), len(rows))
+            except Exception as e:
+                logger.error(f"Error in status broadcaster: {str(e)}", exc_info=True)
+
+
+status_broadcaster = StatusBroadcaster(
+    dag_snapshot,
+    interval=Config.LIVE_REFRESH_INTERVAL
+)
@@ -1,32 +1,345 @@
 from functools import wraps
+import os
 import time
+import threading
+import sqlite3
 import psutil
 import gc
+from collections import OrderedDict
 from flask import current_app
 import logging
 from flask_caching import Cache
+from flask_caching.backends.base import BaseCache
+from cachelib.serializers import SimpleSerializer
 
 # Initialize logging
 logger = logging.getLogger('dashboard')
 
-# Initialize cache with configuration
-cache = Cache(config={
-    'CACHE_TYPE': 'SimpleCache',
-    'CACHE_DEFAULT_TIMEOUT': 300
-})
+# Cache backends selectable by short name through CACHE_TYPE
+CACHE_BACKENDS = {
+    'BoundedCache': 'app.utils.cache.BoundedCache',
+    'SQLiteCache': 'app.utils.cache.SQLiteCache'
+}
+
+# Initialize cache; the backend and its limits come from the app config
+cache = Cache()
 
 # Cache management variables
 last_cleanup_time = time.time()
 
+
+class BoundedCache(BaseCache):
+    """In-memory cache bounded by entry count and total payload size.
+
+    Values are pickled once on ``set`` and each entry is charged its pickled
+    size. When either ``threshold`` entries or ``max_bytes`` are exceeded,
+    expired entries are dropped first, then the least recently used ones.
+    """
+
+    serializer = SimpleSerializer()
+
+    def __init__(self, threshold=500, max_bytes=64 * 1024 * 1024,
+                 default_timeout=300, ignore_delete_many_errors=False):
+        BaseCache.__init__(self, default_timeout=default_timeout,
+                           ignore_delete_many_errors=ignore_delete_many_errors)
+        self._threshold = threshold or 500
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self._stats = {
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'expirations': 0,
+            'rejected': 0
+        }
+
+    @classmethod
+    def factory(cls, app, config, args, kwargs):
+        kwargs.update(dict(
+            threshold=config['CACHE_THRESHOLD'],
+            max_bytes=config.get('CACHE_MAX_MEMORY', 64) * 1024 * 1024
+        ))
+        return cls(*args, **kwargs)
+
+    def _normalize_timeout(self, timeout):
+        timeout = BaseCache._normalize_timeout(self, timeout)
+        return time.time() + timeout if timeout > 0 else 0
+
+    @staticmethod
+    def _entry_size(key, payload):
+        return len(key) + len(payload)
+
+    def _remove(self, key):
+        _, payload = self._entries.pop(key)
+        self._bytes -= self._entry_size(key, payload)
+
+    def _is_expired(self, expires, now):
+        return expires != 0 and expires <= now
+
+    def _evict(self, max_entries, max_bytes):
+        """Drop expired, then least recently used entries until within limits"""
+        if len(self._entries) <= max_entries and self._bytes <= max_bytes:
+            return
+
+        now = time.time()
+        expired = [key for key, (expires, _) in self._entries.items()
+                   if self._is_expired(expires, now)]
+        for key in expired:
+            self._remove(key)
+        self._stats['expirations'] += len(expired)
+
+        while self._entries and (len(self._entries) > max_entries or self._bytes > max_bytes):
+            self._remove(next(iter(self._entries)))
+            self._stats['evictions'] += 1
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats['misses'] += 1
+                return None
+            expires, payload = entry
+            if self._is_expired(expires, time.time()):
+                self._remove(key)
+                self._stats['expirations'] += 1
+                self._stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats['hits'] += 1
+        return self.serializer.loads(payload)
+
+    def set(self, key, value, timeout=None):
+        payload = self.serializer.dumps(value)
+        expires = self._normalize_timeout(timeout)
+        size = self._entry_size(key, payload)
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if size > self.max_bytes:
+                self._stats['rejected'] += 1
+                logger.warning("Cache entry %s (%d bytes) exceeds the cache budget, not cached",
+                               key, size)
+                return False
+            self._entries[key] = (expires, payload)
+            self._bytes += size
+            self._evict(self._threshold, self.max_bytes)
+        return True
+
+    def add(self, key, value, timeout=None):
+        with self._lock:
+            if self.has(key):
+                return False
+            return self.set(key, value, timeout)
+
+    def delete(self, key):
+        with self._lock:
+            if key not in self._entries:
+                return False
+            self._remove(key)
+            return True
+
+    def has(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and not self._is_expired(entry[0], time.time())
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+        return True
+
+    def trim(self, fraction=0.5):
+        """Evict least recently used entries until at most ``fraction`` of the
+        current size remains. Returns the number of bytes freed."""
+        with self._lock:
+            before = self._bytes
+            self._evict(self._threshold, int(before * fraction))
+            return before - self._bytes
+
+    def stats(self):
+        """Return size and hit/miss/eviction counters"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats.update({
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_entries': self._threshold,
+                'max_bytes': self.max_bytes
+            })
+        return stats
+
+
+class SQLiteCache(BaseCache):
+    """Cache stored in one SQLite file shared by all worker processes on a host.
+
+    Every write is a single atomic statement and WAL mode lets workers keep
+    reading while another one writes. Once the table grows past
+    ``threshold`` entries, expired entries are purged first, then those
+    closest to expiry.
+    """
+
+    serializer = SimpleSerializer()
+
+    def __init__(self, path, threshold=500, default_timeout=300,
+                 ignore_delete_many_errors=False):
+        BaseCache.__init__(self, default_timeout=default_timeout,
+                           ignore_delete_many_errors=ignore_delete_many_errors)
+        self.path = path
+        self._threshold = threshold or 500
+        self._local = threading.local()
+        self._stats = {'hits': 0, 'misses': 0, 'errors': 0}
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._connection().execute("""
+            CREATE TABLE IF NOT EXISTS cache_entries (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                expires REAL NOT NULL
+            )
+        """)
+        self._connection().execute(
+            "CREATE INDEX IF NOT EXISTS idx_cache_entries_expires ON cache_entries (expires)")
+
+    @classmethod
+    def factory(cls, app, config, args, kwargs):
+        cache_dir = config['CACHE_DIR'] or os.path.join(app.instance_path, 'cache')
+        kwargs.update(dict(
+            path=os.path.join(cache_dir, 'cache.sqlite'),
+            threshold=config['CACHE_THRESHOLD']
+        ))
+        return cls(*args, **kwargs)
+
+    def _connection(self):
+        """Return this thread's connection, reopening it after a fork"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _normalize_timeout(self, timeout):
+        timeout = BaseCache._normalize_timeout(self, timeout)
+        return time.time() + timeout if timeout > 0 else 0
+
+    def _prune(self, conn):
+        count = conn.execute("SELECT COUNT(*) FROM cache_entries").fetchone()[0]
+        if count <= self._threshold:
+            return
+        conn.execute("DELETE FROM cache_entries WHERE expires != 0 AND expires <= ?",
+                     (time.time(),))
+        # Entries that never expire are evicted last
+        conn.execute("""
+            DELETE FROM cache_entries WHERE key IN (
+                SELECT key FROM cache_entries
+                ORDER BY CASE WHEN expires = 0 THEN 1 ELSE 0 END, expires
+                LIMIT MAX((SELECT COUNT(*) FROM cache_entries) - ?, 0)
+            )
+        """, (self._threshold,))
+
+    def get(self, key):
+        try:
+            row = self._connection().execute(
+                "SELECT value, expires FROM cache_entries WHERE key = ?", (key,)).fetchone()
+        except sqlite3.Error as e:
+            self._stats['errors'] += 1
+            logger.warning("SQLite cache read failed for %s: %s", key, str(e))
+            return None
+        if row is None or (row[1] != 0 and row[1] <= time.time()):
+            self._stats['misses'] += 1
+            return None
+        self._stats['hits'] += 1
+        return self.serializer.loads(row[0])
+
+    def set(self, key, value, timeout=None):
+        payload = self.serializer.dumps(value)
+        try:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO cache_entries (key, value, expires) VALUES (?, ?, ?)",
+                (key, sqlite3.Binary(payload), self._normalize_timeout(timeout)))
+            self._prune(conn)
+            return True
+        except sqlite3.Error as e:
+            self._stats['errors'] += 1
+            logger.warning("SQLite cache write failed for %s: %s", key, str(e))
+            return False
+
+    def add(self, key, value, timeout=None):
+        payload = self.serializer.dumps(value)
+        try:
+            # Only replaces an existing row if it has expired
+            cur = self._connection().execute("""
+                INSERT INTO cache_entries (key, value, expires) VALUES (?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET value = excluded.value, expires = excluded.expires
+                WHERE cache_entries.expires != 0 AND cache_entries.expires <= ?
+            """, (key, sqlite3.Binary(payload), self._normalize_timeout(timeout), time.time()))
+            return cur.rowcount == 1
+        except sqlite3.Error as e:
+            self._stats['errors'] += 1
+            logger.warning("SQLite cache add failed for %s: %s", key, str(e))
+            return False
+
+    def delete(self, key):
+        try:
+            cur = self._connection().execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+            return cur.rowcount == 1
+        except sqlite3.Error as e:
+            self._stats['errors'] += 1
+            logger.warning("SQLite cache delete failed for %s: %s", key, str(e))
+            return False
+
+    def has(self, key):
+        try:
+            row = self._connection().execute(
+                "SELECT expires FROM cache_entries WHERE key = ?", (key,)).fetchone()
+        except sqlite3.Error:
+            return False
+        return row is not None and (row[0] == 0 or row[0] > time.time())
+
+    def clear(self):
+        try:
+            self._connection().execute("DELETE FROM cache_entries")
+            return True
+        except sqlite3.Error as e:
+            logger.warning("SQLite cache clear failed: %s", str(e))
+            return False
+
+    def stats(self):
+        """Return this process's hit/miss counters and the shared table size"""
+        stats = dict(self._stats)
+        try:
+            entries, size = self._connection().execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(value)), 0) FROM cache_entries").fetchone()
+            stats.update({'entries': entries, 'bytes': size})
+        except sqlite3.Error as e:
+            logger.warning("SQLite cache stats failed: %s", str(e))
+        stats.update({'path': self.path, 'max_entries': self._threshold})
+        return stats
+
+
 def init_cache(app):
     """Initialize cache with app"""
     try:
+        cache_type = app.config.get('CACHE_TYPE', 'SimpleCache')
+        app.config['CACHE_TYPE'] = CACHE_BACKENDS.get(cache_type, cache_type)
         cache.init_app(app)
-        logger.info("Cache initialized successfully")
+        logger.info("Cache initialized successfully (%s)", app.config['CACHE_TYPE'])
     except Exception as e:
         logger.error(f"Failed to initialize cache: {str(e)}")
         raise
 
+def get_cache_stats():
+    """Return backend statistics when the active cache backend provides them"""
+    backend = cache.cache
+    return backend.stats() if hasattr(backend, 'stats') else {}
+
 def get_memory_usage():
     """Get current memory usage in MB"""
     process = psutil.Process()
@@ -39,16 +352,26 @@ def monitor_cache(f):
         global last_cleanup_time
         try:
             current_time = time.time()
-            if current_time - last_cleanup_time > 300:  # 5 minutes
+            interval = current_app.config.get('CLEANUP_INTERVAL', 300)
+            if current_time - last_cleanup_time > interval:
+                last_cleanup_time = current_time
                 memory_usage = get_memory_usage()
-                if memory_usage > 500:  # 500MB threshold
-                    gc.collect()
-                    cache.clear()
-                    last_cleanup_time = current_time
-                    logger.info(
-                        "Cache cleanup performed. Memory usage: %.2f MB",
-                        get_memory_usage()
-                    )
+                if memory_usage > current_app.config.get('MEMORY_THRESHOLD', 500):
+                    backend = cache.cache
+                    if hasattr(backend, 'trim'):
+                        # Shed the coldest half instead of flushing hot entries
+                        freed = backend.trim(0.5)
+                        logger.info(
+                            "Cache trimmed by %d bytes. Memory usage: %.2f MB",
+                            freed, get_memory_usage()
+                        )
+                    else:
+                        gc.collect()
+                        cache.clear()
+                        logger.info(
+                            "Cache cleanup performed. Memory usage: %.2f MB",
+                            get_memory_usage()
+                        )
         except Exception as e:
             logger.error(f"Error in cache monitoring: {str(e)}")
         return f(*args, **kwargs)
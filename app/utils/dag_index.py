@@ -0,0 +1,54 @@
+import logging
+import time
+
+logger = logging.getLogger('dashboard')
+
+# Statuses every subject area reports a count for, even when zero
+STATUSES = ('success', 'running', 'failed', 'yet_to_start')
+
+class DagIndex:
+    """Grouped DAG data indexed by subject area and normalized status.
+
+    Built once per snapshot refresh so request handlers only do dictionary
+    lookups. ``counts`` maps each subject area to per-status counts plus a
+    ``total``. When ``previous`` and ``changed`` are given, only the subject
+    areas in ``changed`` are re-indexed and the rest are reused.
+    """
+
+    def __init__(self, grouped_data, previous=None, changed=None):
+        start_time = time.time()
+        self.grouped_data = grouped_data
+        self.by_status = {}
+        self.counts = {}
+
+        for subject_area, rows in grouped_data.items():
+            if (previous is not None and changed is not None and
+                    subject_area not in changed and subject_area in previous.counts):
+                self.by_status[subject_area] = previous.by_status[subject_area]
+                self.counts[subject_area] = previous.counts[subject_area]
+                continue
+
+            buckets = {status: [] for status in STATUSES}
+            for row in rows:
+                status = row.status
+                if status not in buckets:
+                    buckets[status] = []
+                buckets[status].append(row)
+
+            self.by_status[subject_area] = buckets
+            counts = {status: len(bucket) for status, bucket in buckets.items()}
+            counts['total'] = len(rows)
+            self.counts[subject_area] = counts
+
+        logger.debug("Built DAG index for %d subject areas in %.3f seconds",
+                    len(self.counts), time.time() - start_time)
+
+    def __len__(self):
+        return len(self.grouped_data)
+
+    def __contains__(self, subject_area):
+        return subject_area in self.grouped_data
+
+    def rows(self, subject_area, status):
+        """Return the rows of ``subject_area`` whose status is ``status``"""
+        return self.by_status.get(subject_area, {}).get(status.lower(), [])
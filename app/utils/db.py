@@ -3,9 +3,17 @@ import os
 import logging
 import time
 import traceback
+import sys
+import threading
+import atexit
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, NamedTuple, Optional
 from cryptography.fernet import Fernet
 from flask_caching import Cache
 import psutil  # Add this import for memory usage monitoring
+from config import Config
 
 logger = logging.getLogger('dashboard')
 
@@ -90,83 +98,469 @@ def get_db_connection():
                     str(e), traceback.format_exc())
         raise
 
+class PoolTimeoutError(Exception):
+    """Raised when no pooled connection becomes available in time"""
+
+
+# Returned by ConnectionPool._checkout when freed slots should be retried
+_RETRY = object()
+
+class _PooledConnection:
+    """A pooled connection together with its bookkeeping timestamps"""
+    __slots__ = ('conn', 'created_at', 'last_used')
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.created_at = time.time()
+        self.last_used = self.created_at
+
+
+class ConnectionPool:
+    """Bounded, thread-safe pool of reusable Vertica connections.
+
+    Connections are health-checked on checkout, evicted after sitting idle
+    for ``idle_timeout`` seconds and recycled once older than
+    ``max_lifetime`` seconds.
+    """
+
+    def __init__(self, connect, max_size=5, timeout=10,
+                 idle_timeout=300, max_lifetime=1800):
+        self._connect = connect
+        self.max_size = max_size
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self.max_lifetime = max_lifetime
+        self.pid = os.getpid()
+
+        self._idle = deque()
+        self._size = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._stats = {
+            'created': 0,
+            'destroyed': 0,
+            'checkouts': 0,
+            'timeouts': 0,
+            'health_check_failures': 0,
+            'wait_time_total': 0.0,
+            'wait_time_max': 0.0
+        }
+
+    def _is_expired(self, entry, now):
+        return (now - entry.created_at > self.max_lifetime or
+                now - entry.last_used > self.idle_timeout)
+
+    def _checkout(self, deadline):
+        """Take an idle connection or reserve a slot for a new one.
+
+        Returns ``(entry, expired)`` where ``entry`` is None when a slot was
+        reserved or _RETRY when the caller should destroy ``expired`` and
+        try again, and ``expired`` lists idle entries the caller must destroy.
+        """
+        expired = []
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise PoolTimeoutError("Connection pool is closed")
+
+                now = time.time()
+                # Oldest idle entries sit at the left of the deque
+                while self._idle and self._is_expired(self._idle[0], now):
+                    expired.append(self._idle.popleft())
+
+                # Most recently released entries sit at the right; they can
+                # still be past max_lifetime, so check each one taken
+                while self._idle:
+                    entry = self._idle.pop()
+                    if self._is_expired(entry, now):
+                        expired.append(entry)
+                        continue
+                    return entry, expired
+                if self._size < self.max_size:
+                    self._size += 1
+                    return None, expired
+                if expired:
+                    # Expired entries still hold slots; free them before waiting
+                    return _RETRY, expired
+
+                remaining = deadline - now
+                if remaining <= 0:
+                    self._stats['timeouts'] += 1
+                    raise PoolTimeoutError(
+                        f"Timed out after {self.timeout}s waiting for a database connection")
+                self._cond.wait(remaining)
+
+    def _is_healthy(self, entry):
+        """Run a lightweight query to make sure the connection is still alive"""
+        try:
+            if entry.conn.closed():
+                return False
+            cur = entry.conn.cursor()
+            cur.execute("SELECT 1")
+            cur.fetchone()
+            cur.close()
+            return True
+        except Exception as e:
+            logger.warning("Pooled connection failed health check: %s", str(e))
+            return False
+
+    def _destroy(self, entry):
+        try:
+            entry.conn.close()
+        except Exception as e:
+            logger.debug("Error closing pooled connection: %s", str(e))
+        with self._cond:
+            self._size -= 1
+            self._stats['destroyed'] += 1
+            self._cond.notify()
+
+    def acquire(self):
+        """Check out a healthy connection, waiting up to ``timeout`` seconds"""
+        wait_start = time.time()
+        deadline = wait_start + self.timeout
+        while True:
+            entry, expired = self._checkout(deadline)
+            for stale in expired:
+                self._destroy(stale)
+
+            if entry is _RETRY:
+                continue
+            if entry is None:
+                try:
+                    entry = _PooledConnection(self._connect())
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+                with self._cond:
+                    self._stats['created'] += 1
+            elif not self._is_healthy(entry):
+                with self._cond:
+                    self._stats['health_check_failures'] += 1
+                self._destroy(entry)
+                continue
+
+            wait_time = time.time() - wait_start
+            with self._cond:
+                self._stats['checkouts'] += 1
+                self._stats['wait_time_total'] += wait_time
+                self._stats['wait_time_max'] = max(self._stats['wait_time_max'], wait_time)
+            return entry
+
+    def release(self, entry, discard=False):
+        """Return a connection to the pool, or close it if it is unusable"""
+        now = time.time()
+        if (discard or self._closed or entry.conn.closed() or
+                now - entry.created_at > self.max_lifetime):
+            self._destroy(entry)
+            return
+
+        entry.last_used = now
+        with self._cond:
+            self._idle.append(entry)
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self):
+        """Context manager yielding a pooled connection.
+
+        Connections that raised an error are discarded rather than reused,
+        since their session state is unknown.
+        """
+        entry = self.acquire()
+        try:
+            yield entry.conn
+        except Exception:
+            self.release(entry, discard=True)
+            raise
+        else:
+            self.release(entry)
+
+    def close(self):
+        """Close all idle connections and refuse further checkouts"""
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._cond.notify_all()
+        for entry in idle:
+            self._destroy(entry)
+
+    def stats(self):
+        """Return a snapshot of the pool metrics"""
+        with self._cond:
+            stats = dict(self._stats)
+            stats.update({
+                'max_size': self.max_size,
+                'size': self._size,
+                'idle': len(self._idle),
+                'in_use': self._size - len(self._idle)
+            })
+        checkouts = stats['checkouts']
+        stats['wait_time_avg'] = stats['wait_time_total'] / checkouts if checkouts else 0.0
+        return stats
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_pool():
+    """Return the process-wide connection pool, creating it on first use.
+
+    The pool is recreated after a fork so gunicorn workers never share
+    sockets inherited from the master process.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None or _pool.pid != os.getpid():
+            _pool = ConnectionPool(
+                get_db_connection,
+                max_size=Config.DB_POOL_SIZE,
+                timeout=Config.DB_POOL_TIMEOUT,
+                idle_timeout=Config.DB_POOL_IDLE_TIMEOUT,
+                max_lifetime=Config.DB_POOL_MAX_LIFETIME
+            )
+            logger.info("Database connection pool created (max_size=%d)", _pool.max_size)
+        return _pool
+
+def pooled_connection():
+    """Check out a connection from the shared pool for use in a with-block"""
+    return get_pool().connection()
+
+def get_pool_stats():
+    """Return metrics for the shared connection pool"""
+    return get_pool().stats()
+
+@atexit.register
+def _close_pool():
+    if _pool is not None and _pool.pid == os.getpid():
+        _pool.close()
+
+DAG_DATA_QUERY = """
+    SELECT 
+        SUBJECT_AREA,
+        DAG_NAME,
+        STATUS,
+        MODIFIED_TS,
+        DAG_START_TIME,
+        DAG_END_TIME,
+        ELAPSED_TIME
+    FROM public.dag_data
+    {where}
+    ORDER BY 
+        SUBJECT_AREA,
+        CASE 
+            WHEN MODIFIED_TS IS NULL THEN 1 
+            ELSE 0 
+        END,
+        MODIFIED_TS DESC
+"""
+
+class DagRecord(NamedTuple):
+    """Compact in-memory representation of one dag_data row.
+
+    The subject area is not stored per record; records live under their
+    subject area key in the grouped data.
+    """
+    dag_name: str
+    status: str
+    modified_ts: Optional[datetime]
+    dag_start_time: Optional[datetime]
+    dag_end_time: Optional[datetime]
+    elapsed_time: Any
+
+    def to_json(self):
+        """Return the record as a JSON-serializable dict"""
+        return self._asdict()
+
+def _intern(value):
+    """Intern a repeated string column value, passing NULL through"""
+    return sys.intern(value) if value is not None else None
+
+def _subject_sort_key(item):
+    # Subject areas in name order with a NULL subject area last, as Vertica orders them
+    return (item[0] is None, item[0] or '')
+
+def normalize_status(status):
+    """Lowercase a raw STATUS value, treating NULL as yet_to_start"""
+    return sys.intern(status.lower()) if status else 'yet_to_start'
+
+# Timing and row count of the most recent successful fetch
+_last_fetch_stats = {}
+
+def fetch_grouped_data(since=None):
+    """Fetch DAG data in a single streaming query and group it by subject area.
+
+    When ``since`` is given only rows with ``MODIFIED_TS >= since`` are
+    fetched. Returns a ``(grouped_data, stats)`` tuple where ``stats`` holds
+    the row count and timings of the fetch. Errors are raised to the caller.
+    """
+    global _last_fetch_stats
+    start_time = time.time()
+    mode = 'full' if since is None else 'delta'
+    logger.debug("Starting fetch_grouped_data (%s)", mode)
+
+    if since is None:
+        query, params = DAG_DATA_QUERY.format(where=''), None
+    else:
+        query, params = DAG_DATA_QUERY.format(where='WHERE MODIFIED_TS >= :since'), {'since': since}
+
+    with pooled_connection() as conn:
+        # Plain list rows avoid building a dict per row
+        cur = conn.cursor()
+
+        logger.debug("Executing main query")
+        cur.execute(query, params)
+        query_duration = time.time() - start_time
+
+        # Stream rows straight into the grouped structure instead of
+        # materializing the whole result set first
+        grouped_data = {}
+        statuses = {}
+        row_count = 0
+        for (subject_area, dag_name, status, modified_ts,
+             dag_start_time, dag_end_time, elapsed_time) in cur.iterate():
+            row_count += 1
+            rows = grouped_data.get(subject_area)
+            if rows is None:
+                rows = grouped_data[_intern(subject_area)] = []
+            if status not in statuses:
+                statuses[status] = normalize_status(status)
+            rows.append(DagRecord(
+                _intern(dag_name),
+                statuses[status],
+                modified_ts,
+                dag_start_time,
+                dag_end_time,
+                elapsed_time
+            ))
+
+        # Prefer the driver's row count when it reports one
+        if cur.rowcount is not None and cur.rowcount >= 0:
+            row_count = cur.rowcount
+        cur.close()
+
+    duration = time.time() - start_time
+    stats = {
+        'mode': mode,
+        'row_count': row_count,
+        'subject_count': len(grouped_data),
+        'query_seconds': round(query_duration, 3),
+        'total_seconds': round(duration, 3),
+        'fetched_at': time.time()
+    }
+    _last_fetch_stats = stats
+    logger.info("Retrieved %d records (%s) in %.2f seconds (query %.2f seconds)",
+               row_count, mode, duration, query_duration)
+    return grouped_data, stats
+
+def get_last_fetch_stats():
+    """Return timing and row count of the most recent successful fetch"""
+    return dict(_last_fetch_stats)
+
+def _record_sort_key(record):
+    # Newest MODIFIED_TS first with NULLs last, matching DAG_DATA_QUERY
+    return (record.modified_ts is not None, record.modified_ts or datetime.min)
+
+def _run_key(record):
+    # Identity of a dag_data row within its subject area: one row per DAG run
+    return record.dag_name, record.dag_start_time
+
+class DagDataLoader:
+    """Keeps grouped DAG data current using MODIFIED_TS watermarks.
+
+    dag_data holds one row per DAG run, so a DAG can have several rows in a
+    subject area; a row is identified by (subject area, DAG name,
+    DAG_START_TIME). The first refresh, and one every
+    ``full_resync_interval`` seconds, reads the whole table. Refreshes in
+    between only fetch rows modified since the last seen MODIFIED_TS and
+    merge them in by that identity, so the other runs of a DAG are kept.
+    A run that has not started has a NULL DAG_START_TIME; when a new started
+    run of the DAG arrives it replaces that row. Deleted rows and rows with
+    a NULL MODIFIED_TS are only reconciled by the full resync.
+    """
+
+    def __init__(self, full_resync_interval=600):
+        self.full_resync_interval = full_resync_interval
+        self._grouped = None
+        self._watermark = None
+        self._last_full_sync = 0
+        self._lock = threading.Lock()
+
+    def request_full_resync(self):
+        """Make the next refresh re-read the whole table"""
+        with self._lock:
+            self._last_full_sync = 0
+
+    def refresh(self):
+        """Bring the grouped data up to date.
+
+        Returns ``(grouped_data, changed)`` where ``changed`` is the set of
+        subject areas that changed, or None after a full resync.
+        """
+        with self._lock:
+            due = time.time() - self._last_full_sync >= self.full_resync_interval
+            if self._grouped is None or self._watermark is None or due:
+                grouped_data, _ = fetch_grouped_data()
+                self._grouped = grouped_data
+                self._watermark = self._max_modified_ts(grouped_data.values())
+                self._last_full_sync = time.time()
+                return self._grouped, None
+
+            delta, _ = fetch_grouped_data(since=self._watermark)
+            changed = self._merge(delta)
+            return self._grouped, changed
+
+    @staticmethod
+    def _max_modified_ts(groups):
+        timestamps = [record.modified_ts for rows in groups for record in rows
+                      if record.modified_ts is not None]
+        return max(timestamps) if timestamps else None
+
+    def _merge(self, delta):
+        """Merge delta rows into a new grouped dict, sharing unchanged lists"""
+        grouped_data = dict(self._grouped)
+        changed = set()
+
+        for subject_area, updates in delta.items():
+            existing = grouped_data.get(subject_area, [])
+            by_run = {_run_key(record): record for record in existing}
+            updates = [record for record in updates if by_run.get(_run_key(record)) != record]
+            if not updates:
+                continue
+
+            updated_runs = {_run_key(record) for record in updates}
+            # A run that started has a new key; drop its yet_to_start row
+            started_dags = {record.dag_name for record in updates
+                            if record.dag_start_time is not None and _run_key(record) not in by_run}
+            rows = [record for record in existing
+                    if _run_key(record) not in updated_runs
+                    and not (record.dag_start_time is None and record.dag_name in started_dags)]
+            rows.extend(updates)
+            rows.sort(key=_record_sort_key, reverse=True)
+            grouped_data[subject_area] = rows
+            changed.add(subject_area)
+
+        if changed:
+            if not changed.issubset(self._grouped):
+                grouped_data = dict(sorted(grouped_data.items(), key=_subject_sort_key))
+            self._grouped = grouped_data
+            logger.info("Merged delta rows into %d subject areas", len(changed))
+
+        watermark = self._max_modified_ts(delta.values())
+        if watermark is not None and watermark > self._watermark:
+            self._watermark = watermark
+        return changed
+
 def get_grouped_data():
     """Get grouped DAG data from database."""
     start_time = time.time()
-    query_start_time = None
     try:
-        logger.debug("Starting get_grouped_data function")
-        
-        with get_db_connection() as conn:
-            cur = conn.cursor('dict')
-            
-            # First, let's check if the table exists and has data
-            check_query = """
-                SELECT COUNT(*) as count 
-                FROM public.dag_data
-            """
-            
-            logger.debug("Checking if table has data")
-            cur.execute(check_query)
-            count = cur.fetchone()['count']
-            logger.debug(f"Total records in table: {count}")
-
-            query = """
-                SELECT 
-                    SUBJECT_AREA,
-                    DAG_NAME,
-                    STATUS,
-                    MODIFIED_TS,
-                    DAG_START_TIME,
-                    DAG_END_TIME,
-                    ELAPSED_TIME
-                FROM public.dag_data
-                ORDER BY 
-                    SUBJECT_AREA,
-                    CASE 
-                        WHEN MODIFIED_TS IS NULL THEN 1 
-                        ELSE 0 
-                    END,
-                    MODIFIED_TS DESC
-            """
-            
-            logger.debug("Executing main query")
-            query_start_time = time.time()
-            cur.execute(query)
-            query_duration = time.time() - query_start_time
-            
-            results = cur.fetchall()
-            logger.info("Retrieved %d records in %.2f seconds", 
-                       len(results), query_duration)
-            
-            # Group results by subject area
-            grouped_data = {}
-            for row in results:
-                subject_area = row['SUBJECT_AREA']
-                if subject_area not in grouped_data:
-                    grouped_data[subject_area] = []
-                grouped_data[subject_area].append({
-                    'subject_area': row['SUBJECT_AREA'],
-                    'dag_name': row['DAG_NAME'],
-                    'status': row['STATUS'].lower() if row['STATUS'] else 'yet_to_start',
-                    'modified_ts': row['MODIFIED_TS'],
-                    'dag_start_time': row['DAG_START_TIME'],
-                    'dag_end_time': row['DAG_END_TIME'],
-                    'elapsed_time': row['ELAPSED_TIME']
-                })
-            
-            duration = time.time() - start_time
-            logger.debug("get_grouped_data completed in %.2f seconds", duration)
-            # Remove or comment out this line to prevent logging the entire dataset
-            # logger.debug("Grouped data: %s", grouped_data)  
-            return grouped_data
-            
+        grouped_data, _ = fetch_grouped_data()
+        return grouped_data
     except Exception as e:
-        logger.error("Error in get_grouped_data:\nError: %s\nTraceback: %s\nQuery duration: %.2f seconds", 
+        logger.error("Error in get_grouped_data:\nError: %s\nTraceback: %s\nDuration: %.2f seconds", 
                     str(e), traceback.format_exc(),
-                    time.time() - query_start_time if query_start_time else 0)
+                    time.time() - start_time)
         return {}
-
-
-
-
@@ -0,0 +1,117 @@
+import logging
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+class HttpClient:
+    """Shared keep-alive HTTP session for outbound API calls.
+
+    Connections are pooled per host (``pool_size`` of them, matching the
+    number of threads that make requests), so the TLS handshake is paid once
+    per worker instead of once per request. Connection errors and retryable
+    statuses are retried with exponential backoff, every request gets a
+    default timeout, and request latency is recorded per host. The session
+    is recreated after a fork so workers never share sockets.
+    """
+
+    def __init__(self, pool_size=10, retries=3, backoff=0.5, timeout=30):
+        self.pool_size = pool_size
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self._session = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._host_stats = {}
+
+    def _create_session(self):
+        retry = Retry(
+            total=self.retries,
+            backoff_factor=self.backoff,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset(['GET', 'HEAD']),
+            raise_on_status=False,
+            respect_retry_after_header=True
+        )
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_size,
+            pool_maxsize=self.pool_size,
+            max_retries=retry,
+            pool_block=True
+        )
+        session = requests.Session()
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    @property
+    def session(self):
+        with self._lock:
+            if self._session is None or self._pid != os.getpid():
+                self._session = self._create_session()
+                self._pid = os.getpid()
+                self._host_stats = {}
+                logger.info(f"HTTP session created (pool_size={self.pool_size}, retries={self.retries})")
+            return self._session
+
+    def get(self, url, **kwargs):
+        """Send a GET through the shared session, recording its latency.
+
+        With ``stream=True`` the latency covers the time to the response
+        headers, not to the end of the body.
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        session = self.session
+        start_time = time.time()
+        try:
+            response = session.get(url, **kwargs)
+        except requests.RequestException:
+            self._record(url, time.time() - start_time, error=True)
+            raise
+        self._record(url, time.time() - start_time, error=response.status_code >= 400)
+        return response
+
+    def _record(self, url, seconds, error=False):
+        host = urlsplit(url).netloc
+        with self._lock:
+            stats = self._host_stats.setdefault(host, {
+                'requests': 0,
+                'errors': 0,
+                'total_seconds': 0.0,
+                'max_seconds': 0.0,
+                'last_seconds': 0.0
+            })
+            stats['requests'] += 1
+            stats['errors'] += int(error)
+            stats['total_seconds'] += seconds
+            stats['max_seconds'] = max(stats['max_seconds'], seconds)
+            stats['last_seconds'] = seconds
+
+    def stats(self):
+        """Return per-host request counts and latency in seconds"""
+        with self._lock:
+            hosts = {}
+            for host, stats in self._host_stats.items():
+                hosts[host] = {key: round(value, 4) if isinstance(value, float) else value
+                               for key, value in stats.items()}
+                hosts[host]['avg_seconds'] = round(stats['total_seconds'] / stats['requests'], 4)
+            return {
+                'pool_size': self.pool_size,
+                'retries': self.retries,
+                'timeout': self.timeout,
+                'hosts': hosts
+            }
+
+    def close(self):
+        with self._lock:
+            if self._session is not None and self._pid == os.getpid():
+                self._session.close()
+            self._session = None
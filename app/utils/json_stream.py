@@ -0,0 +1,137 @@
+import codecs
+import json
+import re
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_STRUCTURAL = re.compile(r'["{}\[\]]')
+# Rest of a JSON string after its opening quote, up to the closing quote
+_STRING_REST = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*"', re.S)
+# Characters that can continue a number the decoder has stopped at
+_NUMBER_CONTINUATION = frozenset('.eE+-0123456789')
+
+class _StreamReader:
+    """Incrementally decoded text buffer over an iterable of byte chunks"""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._utf8 = codecs.getincrementaldecoder('utf-8')()
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+
+    def more(self):
+        """Append the next chunk to the buffer, dropping consumed text.
+        Returns False once the input is exhausted."""
+        if self.eof:
+            return False
+        if self.pos:
+            self.buf = self.buf[self.pos:]
+            self.pos = 0
+        for chunk in self._chunks:
+            text = self._utf8.decode(chunk)
+            if text:
+                self.buf += text
+                return True
+        self.buf += self._utf8.decode(b'', final=True)
+        self.eof = True
+        return False
+
+    def peek(self):
+        """Skip whitespace and return the next character ('' at end of input)"""
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf) or not self.more():
+                break
+        return self.buf[self.pos] if self.pos < len(self.buf) else ''
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"Expected {char!r} at offset {self.pos} of JSON stream")
+        self.pos += 1
+
+    def _may_continue(self, value, end):
+        """Whether a value decoded up to ``end`` could still grow with more input.
+
+        Anything ending the buffer is decoded again once more input arrives.
+        A number followed by the start of a fraction or exponent is too, since
+        the decoder stops early on a number split across chunks (``1`` then ``.0``).
+        """
+        if end == len(self.buf):
+            return True
+        is_number = isinstance(value, (int, float)) and not isinstance(value, bool)
+        return is_number and self.buf[end] in _NUMBER_CONTINUATION
+
+    def read_value(self):
+        """Decode the next value, reading more input until it is complete"""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buf, self.pos)
+                if self.eof or not self._may_continue(value, end):
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self.more()
+
+    def skip_value(self):
+        """Move past the next value without decoding it"""
+        if self.peek() not in ('{', '['):
+            # Scalars are small enough to decode and drop
+            self.read_value()
+            return
+
+        depth = 0
+        while True:
+            match = _STRUCTURAL.search(self.buf, self.pos)
+            if match is None:
+                self.pos = len(self.buf)
+                if not self.more():
+                    raise ValueError("Unexpected end of JSON stream")
+                continue
+
+            if match.group() == '"':
+                string_end = _STRING_REST.match(self.buf, match.end())
+                if string_end is None:
+                    # The string continues in the next chunk
+                    self.pos = match.start()
+                    if not self.more():
+                        raise ValueError("Unterminated string in JSON stream")
+                    continue
+                self.pos = string_end.end()
+                continue
+
+            self.pos = match.end()
+            depth += 1 if match.group() in '{[' else -1
+            if depth == 0:
+                return
+
+def read_members(chunks, keys):
+    """Return selected top-level members of a JSON object read from byte chunks.
+
+    Members not in ``keys`` are skipped without being decoded, and reading
+    stops as soon as every requested key has been seen, so memory use does
+    not depend on the size of the members that are skipped.
+    """
+    reader = _StreamReader(chunks)
+    wanted = set(keys)
+    found = {}
+
+    reader.expect('{')
+    while len(found) < len(wanted):
+        char = reader.peek()
+        if char in ('}', ''):
+            break
+        if char == ',':
+            reader.pos += 1
+            continue
+
+        key = reader.read_value()
+        reader.expect(':')
+        if key in wanted:
+            found[key] = reader.read_value()
+        else:
+            reader.skip_value()
+    return found
@@ -0,0 +1,85 @@
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger('package')
+
+class PackageMonitor:
+    """Rebuilds the package snapshot on a background thread.
+
+    ``build_snapshot`` is called every ``interval`` seconds and its result
+    is kept in memory, so request handlers only read the latest snapshot
+    and PyPI traffic does not grow with the number of open pages. The
+    thread starts on first use and is restarted in forked workers.
+    """
+
+    def __init__(self, build_snapshot, interval=300):
+        self._build_snapshot = build_snapshot
+        self.interval = interval
+        self._snapshot = None
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._refreshed = threading.Condition()
+        self._building = False
+        # Builds finished, successful or not
+        self._builds_done = 0
+        self.last_refresh_seconds = None
+
+    def start(self):
+        """Start the background thread if it is not running in this process"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(
+                target=self._run,
+                name='package-monitor',
+                daemon=True
+            )
+            self._thread.start()
+            logger.info(f"Package monitor started (interval {self.interval}s)")
+
+    def get(self, timeout=None):
+        """Return the latest snapshot, waiting up to ``timeout`` for the first one"""
+        self.start()
+        with self._refreshed:
+            if self._snapshot is None:
+                self._refreshed.wait_for(lambda: self._snapshot is not None, timeout)
+            return self._snapshot
+
+    def refresh(self, timeout=None):
+        """Ask for an immediate refresh and wait up to ``timeout`` for it"""
+        self.start()
+        with self._refreshed:
+            # A build already in flight may have read PyPI before this call,
+            # so wait for the one after it
+            target = self._builds_done + (2 if self._building else 1)
+            self._wakeup.set()
+            self._refreshed.wait_for(lambda: self._builds_done >= target, timeout)
+            return self._snapshot
+
+    def _run(self):
+        while True:
+            with self._refreshed:
+                # Cleared before building so requests made during a build are not lost
+                self._wakeup.clear()
+                self._building = True
+            start_time = time.time()
+            try:
+                snapshot = self._build_snapshot()
+                with self._refreshed:
+                    self._snapshot = snapshot
+                    self.last_refresh_seconds = time.time() - start_time
+                logger.info(f"Package snapshot refreshed in {self.last_refresh_seconds:.2f}s")
+            except Exception as e:
+                logger.error(f"Error refreshing package snapshot: {str(e)}", exc_info=True)
+            finally:
+                with self._refreshed:
+                    self._building = False
+                    self._builds_done += 1
+                    self._refreshed.notify_all()
+
+            self._wakeup.wait(self.interval)
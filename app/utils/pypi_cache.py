@@ -0,0 +1,78 @@
+import json
+import logging
+import os
+import re
+import tempfile
+import time
+
+logger = logging.getLogger('package')
+
+class PackageMetadataCache:
+    """On-disk cache of PyPI package metadata, one JSON file per package.
+
+    Each entry keeps the metadata together with the ``ETag`` and
+    ``Last-Modified`` validators of the response it came from, so stale
+    entries can be revalidated with a conditional GET. Files are written to
+    a temporary name and renamed into place, so concurrent workers never
+    read a partial entry.
+    """
+
+    def __init__(self, cache_dir, ttl=600):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, package_name):
+        # PEP 503 normalization so "Pillow" and "pillow" share an entry
+        normalized = re.sub(r'[-_.]+', '-', package_name).lower()
+        return os.path.join(self.cache_dir, f"{normalized}.json")
+
+    def load(self, package_name):
+        """Return the cached entry for ``package_name``, or None"""
+        try:
+            with open(self._path(package_name), 'r', encoding='utf-8') as cache_file:
+                return json.load(cache_file)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable metadata cache entry for {package_name}: {str(e)}")
+            return None
+
+    def is_fresh(self, entry):
+        return entry is not None and time.time() - entry.get('fetched_at', 0) < self.ttl
+
+    def store(self, package_name, metadata, etag=None, last_modified=None):
+        """Atomically write a new entry and return it"""
+        entry = {
+            'fetched_at': time.time(),
+            'etag': etag,
+            'last_modified': last_modified,
+            'metadata': metadata
+        }
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as tmp_file:
+                json.dump(entry, tmp_file)
+            os.replace(tmp_path, self._path(package_name))
+        except OSError as e:
+            logger.warning(f"Failed to write metadata cache entry for {package_name}: {str(e)}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+        return entry
+
+    def touch(self, entry, package_name):
+        """Mark an entry as freshly revalidated (after a 304 response)"""
+        return self.store(package_name, entry['metadata'],
+                          entry.get('etag'), entry.get('last_modified'))
+
+    def conditional_headers(self, entry):
+        """Return the request headers needed to revalidate ``entry``"""
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
@@ -0,0 +1,149 @@
+import logging
+import threading
+import time
+from config import Config
+from app.utils.db import DagDataLoader
+from app.utils.dag_index import DagIndex
+
+logger = logging.getLogger('dashboard')
+
+class SnapshotCache:
+    """Process-wide cache holding a single snapshot produced by ``loader``.
+
+    Only one refresh runs at a time. Within ``ttl`` seconds the snapshot is
+    served as is; for up to ``max_stale`` seconds after that it is still
+    served while a background refresh runs. Older snapshots, or a missing
+    one, block the caller until the in-flight refresh finishes. A failed
+    refresh keeps serving the previous snapshot.
+    """
+
+    def __init__(self, loader, ttl=30, max_stale=300, name='snapshot'):
+        self._loader = loader
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.name = name
+
+        self._value = None
+        self._loaded_at = None
+        self._refreshing = False
+        self._lock = threading.Lock()
+        self._refreshed = threading.Condition(self._lock)
+        self._stats = {
+            'hits': 0,
+            'stale_hits': 0,
+            'misses': 0,
+            'refreshes': 0,
+            'refresh_failures': 0,
+            'last_refresh_seconds': None,
+            'last_error': None
+        }
+
+    def get(self):
+        """Return the current snapshot, refreshing it if needed"""
+        with self._lock:
+            age = self._age()
+            if age is not None and age < self.ttl:
+                self._stats['hits'] += 1
+                return self._value
+
+            if age is not None and age < self.ttl + self.max_stale:
+                self._stats['stale_hits'] += 1
+                if not self._refreshing:
+                    self._refreshing = True
+                    threading.Thread(
+                        target=self._refresh,
+                        name=f'{self.name}-refresh',
+                        daemon=True
+                    ).start()
+                return self._value
+
+            self._stats['misses'] += 1
+            if self._refreshing:
+                while self._refreshing:
+                    self._refreshed.wait()
+                return self._value
+            self._refreshing = True
+
+        self._refresh()
+        return self._value
+
+    def refresh(self):
+        """Refresh the snapshot now, or wait for the refresh already running"""
+        with self._lock:
+            if self._refreshing:
+                while self._refreshing:
+                    self._refreshed.wait()
+                return self._value
+            self._refreshing = True
+
+        self._refresh()
+        return self._value
+
+    def peek(self):
+        """Return the current snapshot without triggering a refresh"""
+        with self._lock:
+            return self._value
+
+    def invalidate(self):
+        """Mark the snapshot as expired so the next read reloads it"""
+        with self._lock:
+            self._loaded_at = None if self._value is None else 0
+
+    def stats(self):
+        """Return hit/refresh counters and the age of the snapshot"""
+        with self._lock:
+            stats = dict(self._stats)
+            age = self._age()
+        stats.update({
+            'name': self.name,
+            'ttl': self.ttl,
+            'max_stale': self.max_stale,
+            'age_seconds': round(age, 3) if age is not None else None
+        })
+        return stats
+
+    def _age(self):
+        if self._loaded_at is None:
+            return None
+        return time.time() - self._loaded_at
+
+    def _refresh(self):
+        """Run the loader; callers must have set ``_refreshing`` first"""
+        start_time = time.time()
+        value = None
+        error = None
+        try:
+            value = self._loader()
+        except Exception as e:
+            error = str(e)
+            logger.error("Error refreshing %s snapshot: %s", self.name, error, exc_info=True)
+
+        duration = time.time() - start_time
+        with self._lock:
+            if error is None:
+                self._value = value
+                self._loaded_at = time.time()
+                self._stats['refreshes'] += 1
+                self._stats['last_refresh_seconds'] = round(duration, 3)
+            else:
+                self._stats['refresh_failures'] += 1
+            self._stats['last_error'] = error
+            self._refreshing = False
+            self._refreshed.notify_all()
+
+        if error is None:
+            logger.info("Refreshed %s snapshot in %.2f seconds", self.name, duration)
+
+
+dag_loader = DagDataLoader(full_resync_interval=Config.DAG_FULL_RESYNC_INTERVAL)
+
+def _load_dag_index():
+    grouped_data, changed = dag_loader.refresh()
+    return DagIndex(grouped_data, previous=dag_snapshot.peek(), changed=changed)
+
+dag_snapshot = SnapshotCache(
+    _load_dag_index,
+    ttl=Config.DAG_SNAPSHOT_TTL,
+    max_stale=Config.DAG_SNAPSHOT_MAX_STALE,
+    name='dag_data'
+)
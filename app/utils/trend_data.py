@@ -0,0 +1,315 @@
+import logging
+import os
+import sys
+import threading
+import time
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# String columns with few distinct values, stored as categoricals
+CATEGORY_COLUMNS = ('batch_name', 'dag_name', 'application_name')
+DATETIME_COLUMNS = ('exe_date', 'max_batch_end_dt')
+COLUMNAR_SUFFIXES = ('.parquet', '.feather')
+# Aggregation levels, finest first, with their period frequency and label format
+AGGREGATION_LEVELS = {
+    'daily': (None, '%d-%m-%y'),
+    'weekly': ('W', 'Wk %d-%m-%y'),
+    'monthly': ('M', '%b %Y')
+}
+# Columns kept in the daily-max tables the graph plots
+DAILY_MAX_COLUMNS = ['exe_date', 'end_hour_float', 'max_batch_end_dt', 'dag_name', 'batch_name']
+
+def columnar_path(csv_path: str, suffix: str = '.parquet') -> str:
+    """Path of the columnar copy of ``csv_path`` with the given suffix"""
+    return os.path.splitext(csv_path)[0] + suffix
+
+def resolve_trend_source(path: str) -> str:
+    """
+    Pick the file to load for ``path``.
+    A Parquet/Feather copy next to a CSV is preferred as long as it is at
+    least as new as the CSV, so a fresh CSV extract is never shadowed by a
+    stale conversion.
+    """
+    if not path.endswith('.csv'):
+        return path
+    csv_mtime = os.path.getmtime(path) if os.path.exists(path) else None
+    for suffix in COLUMNAR_SUFFIXES:
+        candidate = columnar_path(path, suffix)
+        if os.path.exists(candidate) and (csv_mtime is None or os.path.getmtime(candidate) >= csv_mtime):
+            return candidate
+    return path
+
+def read_trend_csv(csv_path: str) -> pd.DataFrame:
+    """Parse a CSV extract into the typed trend schema"""
+    df = pd.read_csv(csv_path, dtype={column: 'category' for column in CATEGORY_COLUMNS})
+    df['exe_date'] = pd.to_datetime(df['exe_date'], format='%d-%m-%Y')
+    df['max_batch_end_dt'] = pd.to_datetime(df['max_batch_end_dt'], format='%d-%m-%Y %H:%M')
+    return df
+
+def read_trend_columnar(path: str) -> pd.DataFrame:
+    """
+    Read a Parquet or Feather file written by ``convert_csv``.
+    Datetime and categorical types come straight from the file, so no text
+    is parsed. Raises ImportError when pyarrow is not installed.
+    """
+    if path.endswith('.feather'):
+        df = pd.read_feather(path)
+    else:
+        df = pd.read_parquet(path)
+    # Files produced by other tools may not carry the categorical types
+    for column in CATEGORY_COLUMNS:
+        if not isinstance(df[column].dtype, pd.CategoricalDtype):
+            df[column] = df[column].astype('category')
+    return df
+
+def load_trend_data(path: str) -> pd.DataFrame:
+    """
+    Load the trend dataset from ``path``, using a columnar copy when available.
+    Falls back to the CSV when pyarrow is missing.
+    Returns the DataFrame with the derived ``end_hour_float`` column.
+    """
+    source = resolve_trend_source(path)
+    if source.endswith(COLUMNAR_SUFFIXES):
+        try:
+            df = read_trend_columnar(source)
+        except ImportError as e:
+            if source == path or not os.path.exists(path):
+                raise
+            logger.warning(f"Cannot read {source} ({str(e)}), falling back to {path}")
+            df = read_trend_csv(path)
+            source = path
+    else:
+        df = read_trend_csv(source)
+
+    df['end_hour_float'] = df['max_batch_end_dt'].dt.hour + df['max_batch_end_dt'].dt.minute / 60
+    logger.info(f"Loaded {len(df)} trend records from {source}")
+    return df
+
+def convert_csv(csv_path: str, out_path: str = None) -> str:
+    """
+    One-time conversion of a CSV extract to Parquet or Feather (chosen by
+    the suffix of ``out_path``, Parquet by default). The file is written
+    under a temporary name and renamed, so a worker reloading the data
+    never reads it half written.
+    Returns: Path of the written file
+    """
+    out_path = out_path or columnar_path(csv_path)
+    df = read_trend_csv(csv_path)
+
+    tmp_path = f"{out_path}.tmp"
+    if out_path.endswith('.feather'):
+        df.to_feather(tmp_path)
+    else:
+        df.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, out_path)
+
+    logger.info(f"Converted {len(df)} records from {csv_path} to {out_path}")
+    return out_path
+
+def resolve_level(level: str, table: pd.DataFrame, max_points: int) -> str:
+    """
+    The aggregation level to plot ``table`` (a daily-max table) at.
+    'auto', or a level that would give more than ``max_points`` points, is
+    coarsened to the finest level that fits; monthly is the coarsest.
+    """
+    levels = list(AGGREGATION_LEVELS)
+    if level != 'auto' and level not in AGGREGATION_LEVELS:
+        raise ValueError(f"Unknown aggregation level '{level}'")
+    if table.empty:
+        return 'daily' if level == 'auto' else level
+
+    span_days = (table['exe_date'].iloc[-1] - table['exe_date'].iloc[0]).days + 1
+    estimates = {'daily': len(table), 'weekly': span_days // 7 + 1, 'monthly': span_days // 28 + 1}
+    first = 0 if level == 'auto' else levels.index(level)
+    for candidate in levels[first:]:
+        if estimates[candidate] <= max_points:
+            return candidate
+    return levels[-1]
+
+def aggregate_max(table: pd.DataFrame, level: str) -> pd.DataFrame:
+    """Reduce a daily-max table to the row with the latest end time per week or month"""
+    freq, label_format = AGGREGATION_LEVELS[level]
+    if freq is None or table.empty:
+        return table
+    period_start = table['exe_date'].dt.to_period(freq).dt.start_time.to_numpy()
+    idx = table.groupby(period_start, sort=True)['end_hour_float'].idxmax()
+    return table.loc[idx.to_numpy()].assign(
+        date_label=pd.DatetimeIndex(idx.index).strftime(label_format)
+    )
+
+def empty_trend_frame() -> pd.DataFrame:
+    """An empty DataFrame with the trend schema"""
+    df = pd.DataFrame({column: pd.Series(dtype='datetime64[ns]') for column in DATETIME_COLUMNS})
+    for column in CATEGORY_COLUMNS:
+        df[column] = pd.Series(dtype='category')
+    df['end_hour_float'] = pd.Series(dtype='float64')
+    return df
+
+def daily_max_tables(df: pd.DataFrame, keys: list) -> dict:
+    """
+    For every group of ``keys``, the row with the latest end time of each
+    execution date, ordered by date, with preformatted ``date_label`` and
+    ``end_label`` columns. With no keys the whole frame is one
+    group, returned under the key None.
+    """
+    idx = df.groupby(keys + ['exe_date'], observed=True, sort=True)['end_hour_float'].idxmax()
+    daily_max = df.loc[idx.to_numpy(), keys + [c for c in DAILY_MAX_COLUMNS if c not in keys]]
+    # Axis and hover labels, formatted once here rather than per callback
+    daily_max = daily_max.assign(
+        date_label=daily_max['exe_date'].dt.strftime('%d-%m-%y'),
+        end_label=daily_max['max_batch_end_dt'].dt.strftime('%H:%M')
+    )
+    if not keys:
+        return {None: daily_max.reset_index(drop=True)}
+    group_key = keys[0] if len(keys) == 1 else keys
+    return {
+        key: daily_max.iloc[positions].reset_index(drop=True)
+        for key, positions in daily_max.groupby(group_key, observed=True).indices.items()
+    }
+
+class TrendDataset:
+    """
+    One loaded version of the trend data together with the indexes derived
+    from it. Never modified after construction; a reload builds a new one.
+    """
+
+    def __init__(self, df: pd.DataFrame, version: str = 'empty'):
+        self.df = df
+        self.version = version
+        self.unique_dates = sorted(df['exe_date'].unique())
+        self.first_date = pd.Timestamp(self.unique_dates[0]) if self.unique_dates else None
+        self.last_date = pd.Timestamp(self.unique_dates[-1]) if self.unique_dates else None
+        self.applications = sorted(df['application_name'].dropna().unique())
+
+        # DAGs of each application in order of first appearance
+        group_rows = df.groupby(['application_name', 'dag_name'], observed=True).indices
+        self.dags_by_app = {}
+        for app, dag in sorted(group_rows, key=lambda key: group_rows[key][0]):
+            self.dags_by_app.setdefault(app, []).append(dag)
+
+        # Daily-max tables for "all", each application and each (application, DAG),
+        # computed once here so graph callbacks only look them up
+        timed = df[df['end_hour_float'].notna()]
+        self.daily_max = {('all', None): daily_max_tables(timed, [])[None]}
+        for app, table in daily_max_tables(timed, ['application_name']).items():
+            self.daily_max[(app, None)] = table
+        for (app, dag), table in daily_max_tables(timed, ['application_name', 'dag_name']).items():
+            self.daily_max[(app, dag)] = table
+
+    def __len__(self):
+        return len(self.df)
+
+    def dags_for(self, app: str) -> list:
+        """DAG names of an application"""
+        return self.dags_by_app.get(app, [])
+
+    def daily_max_for(self, app: str, dag: str = None) -> pd.DataFrame:
+        """Daily-max table for a selection; ``dag`` is ignored for 'all'"""
+        if app == 'all':
+            dag = None
+        table = self.daily_max.get((app, dag))
+        return table if table is not None else self.daily_max[('all', None)].iloc[0:0]
+
+    def window(self, app: str, dag: str = None, start=None, end=None,
+               level: str = 'auto', max_points: int = 400) -> tuple:
+        """
+        Daily-max rows of a selection between ``start`` and ``end`` (inclusive
+        dates, either may be None), aggregated so that at most about
+        ``max_points`` rows remain.
+        Returns: (table, level actually used)
+        """
+        table = self.daily_max_for(app, dag)
+        if start is not None or end is not None:
+            # Tables are ordered by date, so the window is a binary search and a slice
+            dates = table['exe_date'].to_numpy()
+            lo = dates.searchsorted(pd.Timestamp(start).to_datetime64()) if start is not None else 0
+            hi = (dates.searchsorted(pd.Timestamp(end).to_datetime64(), side='right')
+                  if end is not None else len(dates))
+            table = table.iloc[lo:hi]
+
+        level = resolve_level(level, table, max_points)
+        return aggregate_max(table, level), level
+
+    def trace_arrays(self, app: str, dag: str = None, start=None, end=None,
+                     level: str = 'auto', max_points: int = 400) -> dict:
+        """NumPy arrays for the graph trace of a selection, plus the level used"""
+        table, level = self.window(app, dag, start, end, level, max_points)
+        return {
+            'x': table['date_label'].to_numpy(),
+            'y': table['end_hour_float'].to_numpy(),
+            'text': table['end_label'].to_numpy(),
+            'customdata': table[['dag_name', 'batch_name']].astype(str).to_numpy(),
+            'level': level
+        }
+
+class TrendDataProvider:
+    """
+    Lazily loads the trend dataset and reloads it when the file changes.
+
+    The file's mtime is checked at most every ``check_interval`` seconds.
+    A changed file is loaded into a new TrendDataset that replaces the old
+    one in a single assignment, so callers always see a consistent
+    DataFrame and indexes. Requests arriving during a reload keep being
+    served the previous dataset, and a failed reload keeps it as well.
+    """
+
+    def __init__(self, path: str, check_interval: float = 60):
+        self.path = path
+        self.check_interval = check_interval
+        self._dataset = None
+        self._stamp = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self) -> TrendDataset:
+        """Return the current dataset, loading or reloading it if needed"""
+        dataset = self._dataset
+        if dataset is None or time.time() - self._checked_at >= self.check_interval:
+            dataset = self._reload_if_changed()
+        return dataset
+
+    def _file_stamp(self):
+        source = resolve_trend_source(self.path)
+        try:
+            stat = os.stat(source)
+        except OSError:
+            return None
+        return source, stat.st_mtime_ns, stat.st_size
+
+    def _reload_if_changed(self) -> TrendDataset:
+        with self._lock:
+            # Another thread may have checked while we waited for the lock
+            if self._dataset is not None and time.time() - self._checked_at < self.check_interval:
+                return self._dataset
+            self._checked_at = time.time()
+
+            stamp = self._file_stamp()
+            if self._dataset is not None and stamp == self._stamp:
+                return self._dataset
+
+            start_time = time.time()
+            try:
+                if stamp is None:
+                    raise FileNotFoundError(f"Trend data file not found at {self.path}")
+                df = load_trend_data(self.path)
+                version = f"{stamp[1]}-{stamp[2]}"
+            except Exception as e:
+                logger.error(f"Error loading trend data: {str(e)}", exc_info=True)
+                if self._dataset is not None:
+                    return self._dataset
+                df = empty_trend_frame()
+                version = 'empty'
+
+            self._dataset = TrendDataset(df, version=version)
+            self._stamp = stamp
+            logger.info(f"Trend dataset {version} ready with {len(df)} records "
+                        f"in {time.time() - start_time:.2f}s")
+            return self._dataset
+
+if __name__ == '__main__':
+    # Usage: python -m app.utils.trend_data dag_data.csv [dag_data.parquet]
+    logging.basicConfig(level=logging.INFO)
+    if len(sys.argv) not in (2, 3):
+        sys.exit("Usage: python -m app.utils.trend_data <csv_path> [output.parquet|output.feather]")
+    print(convert_csv(*sys.argv[1:]))
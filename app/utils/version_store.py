@@ -0,0 +1,110 @@
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+import pytz
+
+logger = logging.getLogger('package')
+
+class VersionStore:
+    """SQLite store of the last-seen version of each monitored package.
+
+    ``record_versions`` diffs a refresh against the stored versions inside
+    one write transaction, so when several workers refresh at once each
+    version change is recorded, and notified, exactly once.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        conn = self._connection()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS package_versions (
+                package TEXT PRIMARY KEY,
+                version TEXT NOT NULL,
+                first_seen TEXT NOT NULL,
+                changed_at TEXT
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS version_changes (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                package TEXT NOT NULL,
+                old_version TEXT NOT NULL,
+                new_version TEXT NOT NULL,
+                created_at TEXT NOT NULL
+            )
+        """)
+
+    def _connection(self):
+        """Return this thread's connection, reopening it after a fork"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def record_versions(self, versions):
+        """Store the latest ``{package: version}`` mapping and return the changes.
+
+        Packages seen for the first time are recorded without a change.
+        Returns a list of ``(package, old_version, new_version)`` tuples.
+        """
+        now = datetime.now(pytz.UTC).isoformat()
+        changes = []
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            stored = {
+                row['package']: row['version']
+                for row in conn.execute("SELECT package, version FROM package_versions")
+            }
+            for package, version in versions.items():
+                old_version = stored.get(package)
+                if old_version is None:
+                    conn.execute(
+                        "INSERT INTO package_versions (package, version, first_seen) VALUES (?, ?, ?)",
+                        (package, version, now))
+                elif old_version != version:
+                    conn.execute(
+                        "UPDATE package_versions SET version = ?, changed_at = ? WHERE package = ?",
+                        (version, now, package))
+                    conn.execute(
+                        "INSERT INTO version_changes (package, old_version, new_version, created_at) "
+                        "VALUES (?, ?, ?, ?)",
+                        (package, old_version, version, now))
+                    changes.append((package, old_version, version))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        for package, old_version, version in changes:
+            logger.info(f"New version detected for {package}: {old_version} -> {version}")
+        return changes
+
+    def recently_updated(self, days):
+        """Return the names of packages whose version changed in the last ``days`` days"""
+        since = (datetime.now(pytz.UTC) - timedelta(days=days)).isoformat()
+        rows = self._connection().execute(
+            "SELECT package FROM package_versions WHERE changed_at >= ?", (since,))
+        return {row['package'] for row in rows}
+
+    def notifications(self, limit=50):
+        """Return the most recent version changes as notification dicts"""
+        rows = self._connection().execute(
+            "SELECT package, old_version, new_version, created_at FROM version_changes "
+            "ORDER BY id DESC LIMIT ?", (limit,))
+        return [{
+            'type': 'info',
+            'message': f"Update available for {row['package']}: {row['new_version']} "
+                       f"(was {row['old_version']})",
+            'package_name': row['package'],
+            'timestamp': row['created_at']
+        } for row in rows]
@@ -1,13 +1,51 @@
 import os
+import re
+import json
 from pathlib import Path
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
+# "name", optionally followed by extras, a version specifier, a marker or "@ url"
+_REQUIREMENT_NAME = re.compile(r'([A-Za-z0-9][A-Za-z0-9._-]*)\s*(?:$|[\[=<>!~;@,\s\\])')
+
+def load_package_names(path):
+    """Read package names from a requirements file or a lock file.
+
+    Understands requirements/constraints syntax (including pip-compile
+    output), Pipfile.lock, and TOML lock files made of [[package]] tables
+    such as poetry.lock and uv.lock. Options, editable installs and bare
+    URLs are skipped; order is kept and duplicate names are dropped.
+    """
+    path = Path(path)
+    text = path.read_text(encoding='utf-8')
+
+    if path.name == 'Pipfile.lock':
+        data = json.loads(text)
+        names = list(data.get('default', {})) + list(data.get('develop', {}))
+    elif '[[package]]' in text:
+        names = re.findall(r'^\[\[package\]\]\s*\nname\s*=\s*"([^"]+)"', text, re.M)
+    else:
+        names = []
+        for line in text.splitlines():
+            line = line.strip()
+            if not line or line.startswith(('#', '-')):
+                continue
+            match = _REQUIREMENT_NAME.match(line)
+            if match:
+                names.append(match.group(1))
+
+    unique_names = []
+    seen = set()
+    for name in names:
+        normalized = re.sub(r'[-_.]+', '-', name).lower()
+        if normalized not in seen:
+            seen.add(normalized)
+            unique_names.append(name)
+    return unique_names
+
 class Config:
-    CACHE_TYPE = 'SimpleCache'
-    CACHE_DEFAULT_TIMEOUT = 300
     # Server configurations
     HOST = os.environ.get('HOST', '0.0.0.0')
     try:
@@ -28,26 +66,50 @@ class Config:
         'database': os.environ.get('DB_NAME', 'default_db'),
         'tlsmode': os.environ.get('DB_TLS_MODE', 'disable')
     }
+
+    # Database connection pool
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 5))
+    DB_POOL_TIMEOUT = int(os.environ.get('DB_POOL_TIMEOUT', 10))  # seconds to wait for a free connection
+    DB_POOL_IDLE_TIMEOUT = int(os.environ.get('DB_POOL_IDLE_TIMEOUT', 300))  # seconds
+    DB_POOL_MAX_LIFETIME = int(os.environ.get('DB_POOL_MAX_LIFETIME', 1800))  # seconds
+
+    # Shared DAG data snapshot
+    DAG_SNAPSHOT_TTL = int(os.environ.get('DAG_SNAPSHOT_TTL', 30))  # seconds
+    DAG_SNAPSHOT_MAX_STALE = int(os.environ.get('DAG_SNAPSHOT_MAX_STALE', 300))  # seconds served stale while refreshing
+    DAG_FULL_RESYNC_INTERVAL = int(os.environ.get('DAG_FULL_RESYNC_INTERVAL', 600))  # seconds between full table reads
+
+    # Live status stream (Server-Sent Events)
+    LIVE_REFRESH_INTERVAL = int(os.environ.get('LIVE_REFRESH_INTERVAL', 30))  # seconds
+    LIVE_HEARTBEAT_INTERVAL = int(os.environ.get('LIVE_HEARTBEAT_INTERVAL', 15))  # seconds
     
     # Package monitoring configuration (new addition)
-    MONITORED_PACKAGES = [
-        "pandas", "pydantic", "numpy", "requests", "flask",
-        "sqlalchemy", "pytest", "django", "tensorflow",
-        "pytorch", "scikit-learn", "matplotlib", "seaborn",
-        "beautifulsoup4", "fastapi", "celery", "redis",
-        "psycopg2-binary", "boto3", "pillow", "opencv-python"
-    ]
-    
-    # Cache settings
-    CACHE_TYPE = "SimpleCache"
-    CACHE_DEFAULT_TIMEOUT = int(os.environ.get('CACHE_TIMEOUT', 300))
-    CACHE_THRESHOLD = int(os.environ.get('CACHE_THRESHOLD', 1000))
-    CACHE_KEY_PREFIX = "dashboard_"
+    # Set MONITORED_PACKAGES_FILE to a requirements or lock file to monitor its packages
+    MONITORED_PACKAGES_FILE = os.environ.get('MONITORED_PACKAGES_FILE')
+    if MONITORED_PACKAGES_FILE:
+        MONITORED_PACKAGES = load_package_names(Path(__file__).parent / MONITORED_PACKAGES_FILE)
+    else:
+        MONITORED_PACKAGES = [
+            "pandas", "pydantic", "numpy", "requests", "flask",
+            "sqlalchemy", "pytest", "django", "tensorflow",
+            "pytorch", "scikit-learn", "matplotlib", "seaborn",
+            "beautifulsoup4", "fastapi", "celery", "redis",
+            "psycopg2-binary", "boto3", "pillow", "opencv-python"
+        ]
+    PACKAGE_PAGE_SIZE = int(os.environ.get('PACKAGE_PAGE_SIZE', 25))  # package cards per page
+    PACKAGE_MAX_PAGE_SIZE = int(os.environ.get('PACKAGE_MAX_PAGE_SIZE', 200))
     
     # Memory management
     CLEANUP_INTERVAL = int(os.environ.get('CLEANUP_INTERVAL', 300))  # 5 minutes
     MEMORY_THRESHOLD = int(os.environ.get('MEMORY_THRESHOLD', 500))  # MB
     
+    # Cache settings
+    CACHE_TYPE = os.environ.get('CACHE_TYPE', 'BoundedCache')
+    CACHE_DEFAULT_TIMEOUT = int(os.environ.get('CACHE_TIMEOUT', 300))
+    CACHE_THRESHOLD = int(os.environ.get('CACHE_THRESHOLD', 1000))  # max entries
+    CACHE_MAX_MEMORY = int(os.environ.get('CACHE_MAX_MEMORY', MEMORY_THRESHOLD // 5))  # MB of cached values
+    CACHE_KEY_PREFIX = "dashboard_"
+    CACHE_DIR = os.environ.get('CACHE_DIR', str(Path(__file__).parent / 'cache'))  # used by SQLiteCache
+    
     # Path configurations
     BASE_DIR = Path(__file__).parent
     LOG_DIR = BASE_DIR / 'logs'
@@ -55,8 +117,24 @@ class Config:
     
     # Package monitoring settings (new addition)
     PYPI_API_URL = "https://pypi.org/pypi/{package}/json"
+    PYPI_RELEASE_URL = "https://pypi.org/pypi/{package}/{version}/json"
     API_TIMEOUT = int(os.environ.get('API_TIMEOUT', 30))  # seconds
     API_RETRY_ATTEMPTS = int(os.environ.get('API_RETRY_ATTEMPTS', 3))
+    API_RETRY_BACKOFF = float(os.environ.get('API_RETRY_BACKOFF', 0.5))  # seconds, doubled on each retry
+    PYPI_MAX_WORKERS = int(os.environ.get('PYPI_MAX_WORKERS', 8))  # concurrent PyPI requests
+    PYPI_BATCH_DEADLINE = int(os.environ.get('PYPI_BATCH_DEADLINE', 15))  # seconds per batch of fetches
+    PYPI_CACHE_DIR = os.environ.get('PYPI_CACHE_DIR', str(Path(__file__).parent / 'cache' / 'pypi'))
+    PYPI_CACHE_TTL = int(os.environ.get('PYPI_CACHE_TTL', 600))  # seconds before revalidating with PyPI
+    PACKAGE_REFRESH_INTERVAL = int(os.environ.get('PACKAGE_REFRESH_INTERVAL', 300))  # seconds between background refreshes
+    VERSION_STORE_PATH = os.environ.get('VERSION_STORE_PATH', str(Path(__file__).parent / 'data' / 'package_versions.sqlite'))
+    PACKAGE_UPDATE_WINDOW_DAYS = int(os.environ.get('PACKAGE_UPDATE_WINDOW_DAYS', 7))  # days a new version is flagged
+    PACKAGE_NOTIFICATION_LIMIT = int(os.environ.get('PACKAGE_NOTIFICATION_LIMIT', 50))
+    
+    # Trend analysis data; a .parquet/.feather copy next to the CSV is used when present
+    TREND_DATA_PATH = os.environ.get('TREND_DATA_PATH', str(Path(__file__).parent / 'dag_data.csv'))
+    TREND_RELOAD_INTERVAL = int(os.environ.get('TREND_RELOAD_INTERVAL', 60))  # seconds between data file checks
+    TREND_FIGURE_CACHE_TIMEOUT = int(os.environ.get('TREND_FIGURE_CACHE_TIMEOUT', 3600))  # seconds
+    TREND_MAX_POINTS = int(os.environ.get('TREND_MAX_POINTS', 400))  # points per graph before coarsening
     
     # Session configurations
     SESSION_TYPE = 'filesystem'
@@ -1,7 +1,7 @@
 from flask import Flask
 from app.routes.dashboard import bp as dashboard_bp
 from app.routes.package import package_bp
-from app.routes.trend import bp as trend_bp, layout, register_callbacks, index_string
+from app.routes.trend import bp as trend_bp, serve_layout, register_callbacks, index_string
 from app.utils.cache import init_cache
 import os
 import logging
@@ -76,7 +76,7 @@ def create_app():
     # Initialize Dash app
     app.logger.info('Initializing Dash app...')
     dash_app = Dash(__name__, server=app, url_base_pathname='/trend/dash/')
-    dash_app.layout = layout
+    dash_app.layout = serve_layout
     dash_app.index_string = index_string
     register_callbacks(dash_app)
     app.logger.info('Dash app initialized')
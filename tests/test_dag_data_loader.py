@@ -0,0 +1,75 @@
+import importlib
+from datetime import datetime
+
+import pytest
+from cryptography.fernet import Fernet
+
+T0 = datetime(2024, 1, 1, 8, 0)
+T1 = datetime(2024, 1, 1, 9, 0)
+T2 = datetime(2024, 1, 1, 10, 0)
+
+@pytest.fixture(scope='module')
+def db(tmp_path_factory):
+    # The module decrypts .env with secret.key from the working directory on import
+    workdir = tmp_path_factory.mktemp('db')
+    (workdir / 'secret.key').write_bytes(Fernet.generate_key())
+    (workdir / '.env').write_text('')
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.chdir(workdir)
+        yield importlib.import_module('app.utils.db')
+
+def _record(db, dag_name, status, modified_ts, dag_start_time=None):
+    return db.DagRecord(dag_name, status, modified_ts, dag_start_time, None, None)
+
+def _loader(db, grouped):
+    loader = db.DagDataLoader()
+    loader._grouped = grouped
+    loader._watermark = db.DagDataLoader._max_modified_ts(grouped.values())
+    return loader
+
+def _statuses(rows):
+    return sorted((record.dag_name, record.status, record.dag_start_time) for record in rows)
+
+def test_started_run_replaces_its_yet_to_start_row(db):
+    loader = _loader(db, {'A': [
+        _record(db, 'load', 'success', T0, T0),
+        _record(db, 'report', 'yet_to_start', T0),
+    ]})
+
+    changed = loader._merge({'A': [_record(db, 'report', 'running', T1, T1)]})
+
+    assert changed == {'A'}
+    assert _statuses(loader._grouped['A']) == [
+        ('load', 'success', T0),
+        ('report', 'running', T1),
+    ]
+
+def test_second_run_of_a_dag_keeps_the_first(db):
+    loader = _loader(db, {'A': [_record(db, 'load', 'success', T0, T0)]})
+
+    loader._merge({'A': [_record(db, 'load', 'running', T2, T2)]})
+
+    assert _statuses(loader._grouped['A']) == [
+        ('load', 'running', T2),
+        ('load', 'success', T0),
+    ]
+
+def test_update_of_known_run_keeps_the_next_pending_run(db):
+    loader = _loader(db, {'A': [
+        _record(db, 'load', 'running', T0, T0),
+        _record(db, 'load', 'yet_to_start', T0),
+    ]})
+
+    loader._merge({'A': [_record(db, 'load', 'success', T1, T0)]})
+
+    assert _statuses(loader._grouped['A']) == [
+        ('load', 'success', T0),
+        ('load', 'yet_to_start', None),
+    ]
+
+def test_unchanged_rows_leave_groups_untouched(db):
+    rows = [_record(db, 'load', 'success', T0, T0)]
+    loader = _loader(db, {'A': rows})
+
+    assert loader._merge({'A': [_record(db, 'load', 'success', T0, T0)]}) == set()
+    assert loader._grouped['A'] is rows
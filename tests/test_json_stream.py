@@ -0,0 +1,34 @@
+import json
+
+import pytest
+
+from app.utils.json_stream import read_members
+
+DOCUMENTS = [
+    b'{"r": 1.0\n}',
+    b'{"a": -12.5e-3, "b": 7E+2, "c": 0, "d": -0.25}',
+    b'{"info": {"name": "x", "tags": ["a", "b\\"]"]}, "urls": [{"size": 123.456}], "n": 10}',
+    b'{"skip": "caf\xc3\xa9 \\u00e9 \\\\", "urls": ["\xe2\x82\xac"], "last": true}',
+    b'{"releases": {"1.0": [{"x": 1e10}]}, "urls": [], "flag": null, "n": 42}',
+]
+
+def _chunks(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+@pytest.mark.parametrize('document', DOCUMENTS)
+@pytest.mark.parametrize('size', [1, 2, 3, 4, 5, 7, 16, 1024])
+def test_members_match_json_loads_at_every_chunk_size(document, size):
+    expected = json.loads(document)
+    assert read_members(_chunks(document, size), list(expected)) == expected
+
+@pytest.mark.parametrize('size', [1, 2, 4])
+def test_unrequested_members_are_skipped(size):
+    document = b'{"r": 1.0\n, "info": {"urls": [1]}, "urls": [{"url": "u"}]}'
+    assert read_members(_chunks(document, size), ['urls']) == {'urls': [{'url': 'u'}]}
+
+def test_missing_keys_are_left_out():
+    assert read_members([b'{"a": 1}'], ['a', 'b']) == {'a': 1}
+
+def test_truncated_document_raises():
+    with pytest.raises(ValueError):
+        read_members(_chunks(b'{"info": {"a": [1, 2', 3), ['urls'])